@@ -12,13 +12,43 @@ import json
 import logging
 import os
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 import aiohttp
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional dependency; fall back to stdlib json
+    orjson = None
+
+try:
+    import msgspec
+    _msgpack_encoder = msgspec.msgpack.Encoder()
+except ImportError:  # optional dependency; msgpack framing disabled
+    _msgpack_encoder = None
+
 logger = logging.getLogger(__name__)
 
 
+def _serialize_message(message) -> Union[str, bytes]:
+    """Serialize an outgoing message at the transport boundary.
+    
+    Pre-encoded str/bytes payloads pass through untouched; dicts and
+    lists are JSON-encoded (orjson when available); msgspec Structs are
+    msgpack-encoded. Owning serialization here means handlers can pass
+    payload objects directly without an extra encode/decode round-trip.
+    """
+    if isinstance(message, (str, bytes)):
+        return message
+    if isinstance(message, (dict, list)):
+        if orjson is not None:
+            return orjson.dumps(message).decode()
+        return json.dumps(message)
+    if _msgpack_encoder is not None:
+        return _msgpack_encoder.encode(message)
+    raise TypeError(f"Unsupported message payload type: {type(message).__name__}")
+
+
 class ConnectionManager:
     """
     Manages WhatsApp connection lifecycle using Baileys library.
@@ -308,13 +338,14 @@ class ConnectionManager:
         except Exception as e:
             logger.error(f"Error during disconnect: {str(e)}")
     
-    async def send_message(self, jid: str, message: str, message_type: str = 'text') -> Dict[str, Any]:
+    async def send_message(self, jid: str, message: Any, message_type: str = 'text') -> Dict[str, Any]:
         """
         Send a message through the connection.
         
         Args:
             jid (str): WhatsApp JID
-            message (str): Message content
+            message: Message content; payload dicts/structs are serialized
+                here, pre-encoded str/bytes pass through as-is
             message_type (str): Type of message ('text', 'media', etc.)
             
         Returns:
@@ -331,7 +362,7 @@ class ConnectionManager:
             result = await self._communicate_with_backend({
                 'action': 'send_message',
                 'jid': jid,
-                'message': message,
+                'message': _serialize_message(message),
                 'type': message_type
             })
             
@@ -341,6 +372,74 @@ class ConnectionManager:
             logger.error(f"Failed to send message: {str(e)}")
             raise
     
+    async def send_batch(self, payload: Union[str, bytes], count: int) -> List[Dict[str, Any]]:
+        """
+        Send a pre-encoded batch of messages in a single framed request.
+        
+        Args:
+            payload (str | bytes): Encoded list of message payloads
+            count (int): Number of messages in the batch
+            
+        Returns:
+            List[Dict[str, Any]]: Per-message send results, in batch order
+        """
+        try:
+            logger.info(f"Sending batch of {count} messages")
+            
+            result = await self._communicate_with_backend({
+                'action': 'send_batch',
+                'payload': payload,
+                'count': count
+            })
+            
+            base_id = result.get('message_id', f"msg_{int(time.time())}")
+            return [
+                {
+                    'status': result.get('status', 'success'),
+                    'message_id': f"{base_id}_{i}",
+                    'timestamp': result.get('timestamp')
+                }
+                for i in range(count)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Failed to send batch: {str(e)}")
+            raise
+    
+    async def send_media_stream(self, jid: str, metadata: Dict[str, Any], chunks) -> Dict[str, Any]:
+        """
+        Send a media upload as a stream of chunks.
+        
+        Args:
+            jid (str): WhatsApp JID
+            metadata (dict): Media metadata (type, file name, size, etc.)
+            chunks: Async iterator yielding the file content in chunks
+            
+        Returns:
+            Dict[str, Any]: Send result
+        """
+        try:
+            # In a real implementation, each chunk would be forwarded to the
+            # Baileys backend as a multipart upload frame
+            logger.info(f"Streaming media upload to {jid}")
+            
+            bytes_sent = 0
+            async for chunk in chunks:
+                bytes_sent += len(chunk)
+            
+            result = await self._communicate_with_backend({
+                'action': 'send_media_stream',
+                'jid': jid,
+                'metadata': metadata,
+                'bytes_sent': bytes_sent
+            })
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Failed to stream media: {str(e)}")
+            raise
+    
     async def _communicate_with_backend(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Communicate with the Baileys backend."""
         try:
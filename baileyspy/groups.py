@@ -9,6 +9,7 @@ Author: MiniMax Agent
 
 import asyncio
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
@@ -28,11 +29,129 @@ class GroupManager:
     - Managing group invites
     """
     
+    #: Maximum number of groups kept in the LRU cache.
+    _cache_max = 4096
+
     def __init__(self):
         """Initialize GroupManager."""
-        self.group_cache = {}
-        
+        self.group_cache = OrderedDict()
+        self._groups_snapshot: Optional[tuple] = None
+        self._mutation_q: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._writer_loop: Optional[asyncio.AbstractEventLoop] = None
+
         logger.info("GroupManager initialized")
+
+    def _invalidate_snapshot(self):
+        """Invalidate the cached group list snapshot after a cache mutation."""
+        self._groups_snapshot = None
+
+    def _evict_stale_entries(self):
+        """Evict least-recently-used groups once the cache exceeds its cap."""
+        while len(self.group_cache) > self._cache_max:
+            evicted_id, _ = self.group_cache.popitem(last=False)
+            logger.debug(f"Evicted group {evicted_id} from cache")
+
+    async def _apply_mutation(self, op: str, group_id: str, payload: Any = None):
+        """
+        Queue a cache mutation for the single-writer apply loop.
+
+        All cache writes go through one consumer coroutine so mutation order
+        is deterministic and readers never observe a half-applied update.
+        The caller is resumed once the writer has applied the delta.
+
+        Args:
+            op (str): Mutation type ('insert', 'delete', 'add', 'remove',
+                'set_name', 'set_description')
+            group_id (str): Group ID the mutation applies to
+            payload: Operation-specific data (participants, name, etc.)
+        """
+        loop = asyncio.get_running_loop()
+        if self._mutation_q is None or self._writer_loop is not loop:
+            # A writer bound to a previous (possibly closed) event loop
+            # can never ack mutations issued from this one — e.g. across
+            # sequential asyncio.run() calls — so start a fresh one here
+            self._cancel_writer()
+            self._mutation_q = asyncio.Queue()
+            self._writer_loop = loop
+            self._writer_task = loop.create_task(self._apply_loop())
+
+        done = asyncio.Event()
+        await self._mutation_q.put((op, group_id, payload, done))
+        await done.wait()
+
+    def _cancel_writer(self):
+        """Cancel the apply-loop task and drop its queue, if any."""
+        task = self._writer_task
+        if task is not None and not task.done():
+            if self._writer_loop is not None and not self._writer_loop.is_closed():
+                task.cancel()
+        self._writer_task = None
+        self._mutation_q = None
+        self._writer_loop = None
+
+    async def shutdown(self):
+        """
+        Stop the cache writer task.
+
+        Call this before discarding the manager (or closing its event
+        loop) to avoid a pending-task warning at loop teardown. Safe to
+        call more than once; the writer is recreated on demand if the
+        manager is used again.
+        """
+        try:
+            task = self._writer_task
+            self._cancel_writer()
+            if task is not None and not task.done():
+                try:
+                    await task
+                except (asyncio.CancelledError, RuntimeError):
+                    # Cancelled is the expected outcome; RuntimeError
+                    # means the task belongs to another loop and will
+                    # be reaped with it
+                    pass
+
+            logger.info("GroupManager writer task stopped")
+
+        except Exception as e:
+            logger.error(f"Failed to shut down group manager: {str(e)}")
+            raise
+
+    async def _apply_loop(self):
+        """Consume queued mutations and apply them to the group cache."""
+        while True:
+            op, group_id, payload, done = await self._mutation_q.get()
+            try:
+                self._apply_delta(op, group_id, payload)
+            except Exception as e:
+                logger.error(f"Failed to apply cache mutation {op}: {str(e)}")
+            finally:
+                done.set()
+                self._mutation_q.task_done()
+
+    def _apply_delta(self, op: str, group_id: str, payload: Any):
+        """Apply a single mutation delta to the group cache."""
+        if op == 'insert':
+            self.group_cache[group_id] = payload
+            self._evict_stale_entries()
+        elif op == 'delete':
+            self.group_cache.pop(group_id, None)
+        elif group_id in self.group_cache:
+            group_info = self.group_cache[group_id]
+            if op == 'add':
+                group_info['participants'] = list(set(group_info['participants'] + payload))
+                group_info['member_count'] = len(group_info['participants'])
+            elif op == 'remove':
+                group_info['participants'] = [
+                    p for p in group_info['participants'] if p not in payload
+                ]
+                group_info['member_count'] = len(group_info['participants'])
+            elif op == 'set_name':
+                group_info['name'] = payload
+            elif op == 'set_description':
+                group_info['description'] = payload
+
+        self._invalidate_snapshot()
     
     async def create_group(self, name: str, participants: List[str], client=None, **kwargs) -> Dict[str, Any]:
         """
@@ -90,7 +209,7 @@ class GroupManager:
                 'member_count': len(participants)
             }
             
-            self.group_cache[group_id] = group_info
+            await self._apply_mutation('insert', group_id, group_info)
             
             logger.info(f"Group '{name}' created with {len(participants)} participants")
             
@@ -118,9 +237,14 @@ class GroupManager:
             # In a real implementation, this would query the Baileys backend
             # for the list of groups
             
-            # Return cached groups or simulate fetching from backend
-            groups = list(self.group_cache.values())
-            
+            # Return cached groups or simulate fetching from backend.
+            # The tuple snapshot is rebuilt only after a cache mutation, so
+            # repeated polling between writes avoids re-copying the cache.
+            if self._groups_snapshot is None:
+                self._groups_snapshot = tuple(self.group_cache.values())
+
+            groups = list(self._groups_snapshot)
+
             logger.info(f"Retrieved {len(groups)} groups")
             return groups
             
@@ -143,6 +267,7 @@ class GroupManager:
             # Check cache first
             if group_id in self.group_cache:
                 group_info = self.group_cache[group_id]
+                self.group_cache.move_to_end(group_id)
                 
                 # In a real implementation, this would refresh group info
                 # from the Baileys backend
@@ -201,10 +326,7 @@ class GroupManager:
             )
             
             # Update cache
-            if group_id in self.group_cache:
-                current_participants = self.group_cache[group_id]['participants']
-                self.group_cache[group_id]['participants'] = list(set(current_participants + participants))
-                self.group_cache[group_id]['member_count'] = len(self.group_cache[group_id]['participants'])
+            await self._apply_mutation('add', group_id, participants)
             
             logger.info(f"Added {len(participants)} participants to group {group_id}")
             
@@ -248,12 +370,7 @@ class GroupManager:
             )
             
             # Update cache
-            if group_id in self.group_cache:
-                current_participants = self.group_cache[group_id]['participants']
-                self.group_cache[group_id]['participants'] = [
-                    p for p in current_participants if p not in participants
-                ]
-                self.group_cache[group_id]['member_count'] = len(self.group_cache[group_id]['participants'])
+            await self._apply_mutation('remove', group_id, participants)
             
             logger.info(f"Removed {len(participants)} participants from group {group_id}")
             
@@ -350,6 +467,80 @@ class GroupManager:
             logger.error(f"Failed to demote participants: {str(e)}")
             raise
     
+    async def add_and_promote(self, group_id: str, add_jids: List[str], promote_jids: List[str], client=None) -> Dict[str, Any]:
+        """
+        Add and promote participants in a group concurrently.
+
+        Both underlying operations are independent network calls, so they are
+        issued with asyncio.gather to overlap their round trips.
+
+        Args:
+            group_id (str): Group ID
+            add_jids (List[str]): List of participant JIDs to add
+            promote_jids (List[str]): List of participant JIDs to promote
+            client: Connection manager instance
+
+        Returns:
+            Dict[str, Any]: Combined operation result
+        """
+        try:
+            add_result, promote_result = await asyncio.gather(
+                self.add_participants(group_id, add_jids, client),
+                self.promote_participants(group_id, promote_jids, client)
+            )
+
+            logger.info(f"Added and promoted participants in group {group_id}")
+
+            return {
+                'status': 'added_and_promoted',
+                'group_id': group_id,
+                'add_result': add_result,
+                'promote_result': promote_result,
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to add and promote participants: {str(e)}")
+            raise
+
+    async def bulk_update_metadata(self, group_id: str, name: str = None, description: str = None, client=None) -> Dict[str, Any]:
+        """
+        Update group name and/or description concurrently.
+
+        Args:
+            group_id (str): Group ID
+            name (str, optional): New group name
+            description (str, optional): New group description
+            client: Connection manager instance
+
+        Returns:
+            Dict[str, Any]: Combined operation result
+        """
+        try:
+            if name is None and description is None:
+                raise ValueError("No metadata updates provided")
+
+            operations = []
+            if name is not None:
+                operations.append(self.update_group_name(group_id, name, client))
+            if description is not None:
+                operations.append(self.update_group_description(group_id, description, client))
+
+            results = await asyncio.gather(*operations)
+
+            logger.info(f"Group metadata updated for group {group_id}")
+
+            return {
+                'status': 'updated',
+                'group_id': group_id,
+                'results': results,
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to bulk update group metadata: {str(e)}")
+            raise
+
     async def update_group_name(self, group_id: str, new_name: str, client=None) -> Dict[str, Any]:
         """
         Update the group name.
@@ -382,8 +573,7 @@ class GroupManager:
             )
             
             # Update cache
-            if group_id in self.group_cache:
-                self.group_cache[group_id]['name'] = new_name
+            await self._apply_mutation('set_name', group_id, new_name)
             
             logger.info(f"Group name updated to '{new_name}' for group {group_id}")
             
@@ -427,8 +617,7 @@ class GroupManager:
             )
             
             # Update cache
-            if group_id in self.group_cache:
-                self.group_cache[group_id]['description'] = description
+            await self._apply_mutation('set_description', group_id, description)
             
             logger.info(f"Group description updated for group {group_id}")
             
@@ -467,8 +656,7 @@ class GroupManager:
             )
             
             # Remove from cache
-            if group_id in self.group_cache:
-                del self.group_cache[group_id]
+            await self._apply_mutation('delete', group_id)
             
             logger.info(f"Left group {group_id}")
             
@@ -597,7 +785,7 @@ class GroupManager:
                 'member_count': 0
             }
             
-            self.group_cache[group_id] = group_info
+            await self._apply_mutation('insert', group_id, group_info)
             
             logger.info(f"Joined group via invite link: {invite_link}")
             
@@ -8,17 +8,191 @@ Author: MiniMax Agent
 """
 
 import asyncio
+import collections
+import functools
+import itertools
 import logging
 import mimetypes
+import mmap
 import os
 import json
-from typing import Dict, Any, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from datetime import datetime
-from pathlib import Path
+import aiofiles
+
+try:
+    import orjson
+except ImportError:  # optional dependency; fall back to stdlib json
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+if orjson is not None:
+    def _dumps(obj) -> str:
+        """Serialize a payload with orjson (3-10x faster than json)."""
+        return orjson.dumps(obj).decode()
+else:
+    _dumps = json.dumps
+
+
+# Chunk size for streamed uploads (256 KB keeps peak RAM per upload small)
+_UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Minimum size before the kernel zero-copy (sendfile) path is attempted
+_SENDFILE_MIN_SIZE = 1 << 20
+
+# Minimum document size before uploads are memory-mapped instead of read
+_MMAP_MIN_SIZE = 1 << 20
+
+# Precomputed payload type tags; avoids an f-string allocation per send
+_SEND_TYPE = {
+    'image': 'send_image',
+    'video': 'send_video',
+    'audio': 'send_audio',
+    'document': 'send_document',
+    'sticker': 'send_sticker'
+}
+
+# WhatsApp per-type upload limits in bytes, hoisted so the hot send path
+# does a single dict probe instead of rebuilding the table per call
+_MAX_SIZES = {
+    'image': 16 << 20,     # 16MB
+    'video': 16 << 20,     # 16MB
+    'audio': 16 << 20,     # 16MB
+    'document': 100 << 20, # 100MB
+    'sticker': 100 << 10   # 100KB
+}
+
+
+def _open_mmap(media_path: str) -> mmap.mmap:
+    """
+    Memory-map a file read-only for upload.
+    
+    The transport sends directly from page cache without a user-space copy;
+    the caller must close the returned map.
+    
+    Args:
+        media_path (str): Path to media file
+        
+    Returns:
+        mmap.mmap: Read-only memory map of the file
+    """
+    with open(media_path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+async def _iter_mmap_chunks(mm: mmap.mmap, chunk_size: int = _UPLOAD_CHUNK_SIZE) -> AsyncIterator[memoryview]:
+    """
+    Yield zero-copy memoryview slices of a memory-mapped file.
+    
+    Args:
+        mm (mmap.mmap): Open read-only memory map
+        chunk_size (int): Bytes per chunk
+        
+    Yields:
+        memoryview: Next slice of the mapped file
+    """
+    view = memoryview(mm)
+    try:
+        for offset in range(0, len(view), chunk_size):
+            yield view[offset:offset + chunk_size]
+    finally:
+        view.release()
+
+
+async def _iter_chunks(media_path: str, chunk_size: int = _UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Yield a media file as fixed-size chunks without loading it into RAM.
+    
+    Args:
+        media_path (str): Path to media file
+        chunk_size (int): Bytes per chunk
+        
+    Yields:
+        bytes: Next chunk of the file
+    """
+    async with aiofiles.open(media_path, 'rb') as f:
+        while True:
+            chunk = await f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _fast_suffix(path: str) -> str:
+    """
+    Return the lowercased file extension without constructing a Path.
+    
+    Args:
+        path (str): File path
+        
+    Returns:
+        str: Lowercased extension including the dot, or '' if none
+    """
+    sep = max(path.rfind('/'), path.rfind('\\'))
+    dot = path.rfind('.')
+    if dot <= sep + 1:
+        return ''
+    return path[dot:].lower()
+
+
+# Supported media extensions, shared by every handler instance
+SUPPORTED_IMAGE_TYPES = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'})
+SUPPORTED_VIDEO_TYPES = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.webm', '.3gp'})
+SUPPORTED_AUDIO_TYPES = frozenset({'.mp3', '.wav', '.ogg', '.aac', '.m4a'})
+SUPPORTED_DOCUMENT_TYPES = frozenset({'.pdf', '.doc', '.docx', '.txt', '.rtf', '.xls', '.xlsx', '.ppt', '.pptx', '.zip', '.rar'})
+
+# Ensure the sticker format resolves even where the platform mimetypes
+# database predates WebP
+mimetypes.add_type('image/webp', '.webp')
+
+# Direct extension-to-MIME map for the narrow image/video/audio buckets;
+# only the wide document extension space falls back to mimetypes
+_EXT_TO_MIME = {
+    '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png',
+    '.gif': 'image/gif', '.webp': 'image/webp', '.bmp': 'image/bmp',
+    '.mp4': 'video/mp4', '.mov': 'video/quicktime', '.avi': 'video/x-msvideo',
+    '.mkv': 'video/x-matroska', '.webm': 'video/webm', '.3gp': 'video/3gpp',
+    '.mp3': 'audio/mpeg', '.wav': 'audio/x-wav', '.ogg': 'audio/ogg',
+    '.aac': 'audio/aac', '.m4a': 'audio/mp4'
+}
+
+
+@functools.lru_cache(maxsize=2048)
+def _guess_mime_cached(media_path: str) -> Optional[str]:
+    """Cached wrapper around mimetypes.guess_type for repeated paths."""
+    return mimetypes.guess_type(media_path)[0]
+
+
+def _mime_for_path(media_path: str) -> Optional[str]:
+    """Two-tier MIME lookup: direct map first, mimetypes fallback."""
+    return _EXT_TO_MIME.get(_fast_suffix(media_path)) or _guess_mime_cached(media_path)
+
+
+@functools.lru_cache(maxsize=256)
+def _prepare_send(media_path: str, mtime_ns: int, file_size: int):
+    """
+    Resolve the static metadata pieces for a media file.
+    
+    Keyed on (path, mtime, size) so repeat sends of the same unchanged file
+    reuse the validated type, name and MIME lookups.
+    
+    Args:
+        media_path (str): Path to media file
+        mtime_ns (int): File modification time in nanoseconds
+        file_size (int): File size in bytes
+        
+    Returns:
+        tuple: (media_type, file_name, mime_type)
+    """
+    return (
+        MediaHandler._media_type_for_suffix(_fast_suffix(media_path)),
+        os.path.basename(media_path),
+        _mime_for_path(media_path)
+    )
+
+
 class MediaHandler:
     """
     Handles WhatsApp media operations.
@@ -30,15 +204,48 @@ class MediaHandler:
     - Handling media captions and metadata
     """
     
-    def __init__(self):
-        """Initialize MediaHandler."""
-        self.supported_image_types = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
-        self.supported_video_types = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.3gp'}
-        self.supported_audio_types = {'.mp3', '.wav', '.ogg', '.aac', '.m4a'}
-        self.supported_document_types = {'.pdf', '.doc', '.docx', '.txt', '.rtf', '.xls', '.xlsx', '.ppt', '.pptx', '.zip', '.rar'}
+    # Aliases to the module-level frozensets, kept for backward compat
+    supported_image_types = SUPPORTED_IMAGE_TYPES
+    supported_video_types = SUPPORTED_VIDEO_TYPES
+    supported_audio_types = SUPPORTED_AUDIO_TYPES
+    supported_document_types = SUPPORTED_DOCUMENT_TYPES
+    
+    # Flat reverse map so media-type dispatch is a single dict probe.
+    # Built in the same precedence order as the old membership-check chain
+    # ('.webp' resolves to 'image' first, as before).
+    _ext_to_type = (
+        {ext: 'image' for ext in SUPPORTED_IMAGE_TYPES} |
+        {ext: 'video' for ext in SUPPORTED_VIDEO_TYPES} |
+        {ext: 'audio' for ext in SUPPORTED_AUDIO_TYPES} |
+        {ext: 'document' for ext in SUPPORTED_DOCUMENT_TYPES}
+    )
+    _ext_to_type.setdefault('.webp', 'sticker')
+    
+    def __init__(self, max_concurrent_uploads: int = 4):
+        """
+        Initialize MediaHandler.
+        
+        Args:
+            max_concurrent_uploads (int): Maximum number of in-flight uploads
+        """
+        self._upload_sem = asyncio.Semaphore(max_concurrent_uploads)
+        self._dict_pool = collections.deque(maxlen=64)
+        self._fallback_id = itertools.count()
         
         logger.info("MediaHandler initialized")
     
+    def _borrow_dict(self) -> Dict[str, Any]:
+        """Rent a payload dict from the free-list, or allocate a new one."""
+        try:
+            return self._dict_pool.pop()
+        except IndexError:
+            return {}
+    
+    def _release_dict(self, d: Dict[str, Any]):
+        """Clear a rented payload dict and return it to the free-list."""
+        d.clear()
+        self._dict_pool.append(d)
+    
     async def send_media(self, jid: str, media_path: str, media_type: str = None, client=None, **kwargs) -> Dict[str, Any]:
         """
         Send a media file to WhatsApp.
@@ -54,77 +261,266 @@ class MediaHandler:
             Dict[str, Any]: Send result information
         """
         try:
-            # Validate file exists
-            if not os.path.exists(media_path):
+            # Single stat call covers both the existence check and the size
+            # limit check below
+            try:
+                file_stats = await asyncio.to_thread(os.stat, media_path)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"Media file not found: {media_path}")
             
+            # Resolve type/name/MIME through the (path, mtime, size)-keyed
+            # cache, so repeat sends of an unchanged file skip the lookups
+            file_size = file_stats.st_size
+            cached_type, file_name, mime_type = _prepare_send(
+                media_path, file_stats.st_mtime_ns, file_size
+            )
+            
             # Determine media type if not provided
             if not media_type:
-                media_type = self._determine_media_type(media_path)
+                media_type = cached_type
             
             if not media_type:
                 raise ValueError(f"Unsupported or unknown media type for file: {media_path}")
             
             # Validate file size (WhatsApp has limits)
-            file_size = os.path.getsize(media_path)
             max_size = self._get_max_file_size(media_type)
             if file_size > max_size:
                 raise ValueError(f"File size ({file_size} bytes) exceeds {media_type} limit ({max_size} bytes)")
             
-            # Prepare media upload data
-            media_data = {
-                'type': f'send_{media_type}',
-                'media_path': media_path,
-                'media_type': media_type,
-                'file_name': os.path.basename(media_path),
-                'file_size': file_size,
-                'mime_type': mimetypes.guess_type(media_path)[0],
-                'caption': kwargs.get('caption'),
-                'quoted_message_id': kwargs.get('quoted_message_id'),
-                'mentioned_jids': kwargs.get('mentioned_jids', []),
-                'view_once': kwargs.get('view_once', False)
-            }
+            return await self._send_media_core(
+                jid, media_path, media_type, file_size, client,
+                _file_name=file_name, _mime_type=mime_type, **kwargs
+            )
+            
+        except Exception as e:
+            logger.error("Failed to send media: %s", str(e))
+            raise
+    
+    async def _send_media_core(self, jid: str, media_path: str, media_type: str, file_size: int, client=None, _file_name: str = None, _mime_type: str = None, **kwargs) -> Dict[str, Any]:
+        """
+        Send an already-validated media file.
+        
+        Callers that have validated the type and size themselves (e.g.
+        send_sticker) enter here directly, skipping the duplicate stat and
+        type resolution in send_media.
+        
+        Args:
+            jid (str): WhatsApp JID
+            media_path (str): Path to media file
+            media_type (str): Validated media type
+            file_size (int): Known file size in bytes
+            client: Connection manager instance
+            **kwargs: Additional options (caption, quoted_message_id, etc.)
             
-            # Add media-specific options
-            if media_type == 'image':
-                media_data['width'] = kwargs.get('width')
-                media_data['height'] = kwargs.get('height')
-                media_data['quality'] = kwargs.get('quality', 'high')  # 'high', 'medium', 'low'
+        Returns:
+            Dict[str, Any]: Send result information
+        """
+        # Prepare media upload data in a pooled dict; the payload is
+        # only needed for the duration of the send, so it is rented from
+        # a small free-list to cut per-send allocations
+        file_name = _file_name if _file_name is not None else os.path.basename(media_path)
+        mime_type = _mime_type if _mime_type is not None else _mime_for_path(media_path)
+        caption = kwargs.get('caption')
+        
+        media_data = self._borrow_dict()
+        media_data['type'] = _SEND_TYPE.get(media_type) or f'send_{media_type}'
+        media_data['media_path'] = media_path
+        media_data['media_type'] = media_type
+        media_data['file_name'] = file_name
+        media_data['file_size'] = file_size
+        media_data['mime_type'] = mime_type
+        media_data['caption'] = caption
+        media_data['quoted_message_id'] = kwargs.get('quoted_message_id')
+        media_data['mentioned_jids'] = kwargs.get('mentioned_jids', [])
+        media_data['view_once'] = kwargs.get('view_once', False)
+        
+        # Add media-specific options
+        if media_type == 'image':
+            media_data['width'] = kwargs.get('width')
+            media_data['height'] = kwargs.get('height')
+            media_data['quality'] = kwargs.get('quality', 'high')  # 'high', 'medium', 'low'
+            
+        elif media_type == 'video':
+            media_data['duration'] = kwargs.get('duration')  # in seconds
+            media_data['loop'] = kwargs.get('loop', False)
+            
+        elif media_type == 'audio':
+            media_data['duration'] = kwargs.get('duration')  # in seconds
+            media_data['audio_type'] = kwargs.get('audio_type', 'voice')  # 'voice', 'music'
+        
+        # Send media through client. Prefer the streamed upload path so
+        # large files go out in fixed-size chunks instead of being read
+        # into memory; fall back to the JSON metadata payload for
+        # clients without streaming support.
+        # The semaphore caps in-flight uploads so callers gathering many
+        # sends cannot exhaust RAM or saturate the link.
+        try:
+            async with self._upload_sem:
+                result = None
                 
-            elif media_type == 'video':
-                media_data['duration'] = kwargs.get('duration')  # in seconds
-                media_data['loop'] = kwargs.get('loop', False)
+                # For large videos/documents over a raw socket transport,
+                # let the kernel copy straight from page cache (sendfile)
+                if media_type in ('video', 'document') and file_size >= _SENDFILE_MIN_SIZE:
+                    result = await self._try_sendfile(jid, media_path, media_data, client)
                 
-            elif media_type == 'audio':
-                media_data['duration'] = kwargs.get('duration')  # in seconds
-                media_data['audio_type'] = kwargs.get('audio_type', 'voice')  # 'voice', 'music'
-            
-            # Send media through client
-            result = await client.send_message(
-                jid=jid,
-                message=json.dumps(media_data),
-                message_type='media'
-            )
-            
-            message_id = result.get('message_id', f"media_{int(asyncio.get_event_loop().time())}")
+                if result is None:
+                    if hasattr(client, 'send_media_stream'):
+                        if media_type == 'document' and file_size >= _MMAP_MIN_SIZE:
+                            # Large documents stream straight from page
+                            # cache via mmap instead of read() copies
+                            mm = await asyncio.to_thread(_open_mmap, media_path)
+                            chunks = _iter_mmap_chunks(mm)
+                            try:
+                                result = await client.send_media_stream(
+                                    jid=jid,
+                                    metadata=media_data,
+                                    chunks=chunks
+                                )
+                            finally:
+                                await chunks.aclose()
+                                mm.close()
+                        else:
+                            result = await client.send_media_stream(
+                                jid=jid,
+                                metadata=media_data,
+                                chunks=_iter_chunks(media_path)
+                            )
+                    else:
+                        result = await client.send_message(
+                            jid=jid,
+                            message=_dumps(media_data),
+                            message_type='media'
+                        )
+        finally:
+            self._release_dict(media_data)
+        
+        message_id = result.get('message_id') or f"media_{next(self._fallback_id)}"
+        
+        logger.info("Media sent: %s to %s", media_type, jid)
+        
+        return {
+            'status': 'sent',
+            'message_id': message_id,
+            'timestamp': datetime.now().isoformat(),
+            'jid': jid,
+            'media_type': media_type,
+            'file_name': file_name,
+            'file_size': file_size,
+            'caption': caption
+        }
+    
+    async def send_media_batch(self, jid: str, media_paths: List[str], client=None, **kwargs) -> Dict[str, Any]:
+        """
+        Send several media files to one JID in a single request.
+        
+        The per-file metadata dicts are grouped and serialized once, so the
+        protocol framing cost is paid per batch instead of per file.
+        
+        Args:
+            jid (str): WhatsApp JID
+            media_paths (List[str]): Paths to media files
+            client: Connection manager instance
+            **kwargs: Additional options applied to every item
             
-            logger.info(f"Media sent: {media_type} to {jid}")
+        Returns:
+            Dict[str, Any]: Batch send result information
+        """
+        try:
+            if not media_paths:
+                raise ValueError("No media files provided to send")
+            
+            items = []
+            for media_path in media_paths:
+                try:
+                    file_stats = await asyncio.to_thread(os.stat, media_path)
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"Media file not found: {media_path}")
+                
+                media_type = self._determine_media_type(media_path)
+                if not media_type:
+                    raise ValueError(f"Unsupported or unknown media type for file: {media_path}")
+                
+                file_size = file_stats.st_size
+                max_size = self._get_max_file_size(media_type)
+                if file_size > max_size:
+                    raise ValueError(f"File size ({file_size} bytes) exceeds {media_type} limit ({max_size} bytes)")
+                
+                items.append({
+                    'type': _SEND_TYPE.get(media_type) or f'send_{media_type}',
+                    'media_path': media_path,
+                    'media_type': media_type,
+                    'file_name': os.path.basename(media_path),
+                    'file_size': file_size,
+                    'mime_type': _mime_for_path(media_path),
+                    'caption': kwargs.get('caption'),
+                    'view_once': kwargs.get('view_once', False)
+                })
+            
+            async with self._upload_sem:
+                result = await client.send_message(
+                    jid=jid,
+                    message=_dumps({'type': 'media_batch', 'items': items}),
+                    message_type='media_batch'
+                )
+            
+            message_id = result.get('message_id') or f"media_{next(self._fallback_id)}"
+            
+            logger.info("Media batch sent: %d items to %s", len(items), jid)
             
             return {
                 'status': 'sent',
                 'message_id': message_id,
                 'timestamp': datetime.now().isoformat(),
                 'jid': jid,
-                'media_type': media_type,
-                'file_name': media_data['file_name'],
-                'file_size': file_size,
-                'caption': media_data.get('caption')
+                'item_count': len(items)
             }
             
         except Exception as e:
-            logger.error(f"Failed to send media: {str(e)}")
+            logger.error("Failed to send media batch: %s", str(e))
             raise
     
+    async def _try_sendfile(self, jid: str, media_path: str, media_data: Dict[str, Any], client=None) -> Optional[Dict[str, Any]]:
+        """
+        Attempt a zero-copy upload via loop.sendfile.
+        
+        Only possible when the client exposes its socket transport; returns
+        None so the caller falls back to the chunked path otherwise.
+        
+        Args:
+            jid (str): WhatsApp JID
+            media_path (str): Path to media file
+            media_data (dict): Prepared media metadata
+            client: Connection manager instance
+            
+        Returns:
+            Optional[Dict[str, Any]]: Send result, or None if unavailable
+        """
+        get_transport = getattr(client, 'get_transport', None)
+        if get_transport is None:
+            return None
+        
+        transport = get_transport()
+        if transport is None:
+            return None
+        
+        loop = asyncio.get_running_loop()
+        file_obj = await asyncio.to_thread(open, media_path, 'rb')
+        try:
+            await loop.sendfile(transport, file_obj)
+        except (NotImplementedError, OSError) as e:
+            logger.debug("sendfile unavailable, falling back to chunked upload: %s", str(e))
+            return None
+        finally:
+            file_obj.close()
+        
+        logger.info("Media sent via zero-copy sendfile to %s", jid)
+        
+        return {
+            'status': 'success',
+            'message_id': None,
+            'timestamp': datetime.now().isoformat()
+        }
+    
     async def send_image(self, jid: str, image_path: str, caption: str = None, client=None, **kwargs) -> Dict[str, Any]:
         """
         Send an image to WhatsApp.
@@ -139,19 +535,16 @@ class MediaHandler:
         Returns:
             Dict[str, Any]: Send result information
         """
-        try:
-            return await self.send_media(
-                jid=jid,
-                media_path=image_path,
-                media_type='image',
-                client=client,
-                caption=caption,
-                **kwargs
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to send image: {str(e)}")
-            raise
+        # send_media performs validation and error logging; forwarding
+        # directly avoids a duplicate log line and an extra frame per call
+        return await self.send_media(
+            jid=jid,
+            media_path=image_path,
+            media_type='image',
+            client=client,
+            caption=caption,
+            **kwargs
+        )
     
     async def send_video(self, jid: str, video_path: str, caption: str = None, client=None, **kwargs) -> Dict[str, Any]:
         """
@@ -167,19 +560,16 @@ class MediaHandler:
         Returns:
             Dict[str, Any]: Send result information
         """
-        try:
-            return await self.send_media(
-                jid=jid,
-                media_path=video_path,
-                media_type='video',
-                client=client,
-                caption=caption,
-                **kwargs
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to send video: {str(e)}")
-            raise
+        # send_media performs validation and error logging; forwarding
+        # directly avoids a duplicate log line and an extra frame per call
+        return await self.send_media(
+            jid=jid,
+            media_path=video_path,
+            media_type='video',
+            client=client,
+            caption=caption,
+            **kwargs
+        )
     
     async def send_audio(self, jid: str, audio_path: str, caption: str = None, audio_type: str = 'voice', client=None, **kwargs) -> Dict[str, Any]:
         """
@@ -196,20 +586,17 @@ class MediaHandler:
         Returns:
             Dict[str, Any]: Send result information
         """
-        try:
-            return await self.send_media(
-                jid=jid,
-                media_path=audio_path,
-                media_type='audio',
-                client=client,
-                caption=caption,
+        # send_media performs validation and error logging; forwarding
+        # directly avoids a duplicate log line and an extra frame per call
+        return await self.send_media(
+            jid=jid,
+            media_path=audio_path,
+            media_type='audio',
+            client=client,
+            caption=caption,
                 audio_type=audio_type,
-                **kwargs
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to send audio: {str(e)}")
-            raise
+            **kwargs
+        )
     
     async def send_document(self, jid: str, document_path: str, caption: str = None, client=None, **kwargs) -> Dict[str, Any]:
         """
@@ -225,19 +612,16 @@ class MediaHandler:
         Returns:
             Dict[str, Any]: Send result information
         """
-        try:
-            return await self.send_media(
-                jid=jid,
-                media_path=document_path,
-                media_type='document',
-                client=client,
-                caption=caption,
-                **kwargs
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to send document: {str(e)}")
-            raise
+        # send_media performs validation and error logging; forwarding
+        # directly avoids a duplicate log line and an extra frame per call
+        return await self.send_media(
+            jid=jid,
+            media_path=document_path,
+            media_type='document',
+            client=client,
+            caption=caption,
+            **kwargs
+        )
     
     async def send_sticker(self, jid: str, sticker_path: str, client=None, **kwargs) -> Dict[str, Any]:
         """
@@ -252,29 +636,20 @@ class MediaHandler:
         Returns:
             Dict[str, Any]: Send result information
         """
-        try:
-            # Validate sticker format
-            file_extension = Path(sticker_path).suffix.lower()
-            if file_extension != '.webp':
-                raise ValueError("Stickers must be in WebP format")
-            
-            # Validate file size (stickers are smaller)
-            file_size = os.path.getsize(sticker_path)
-            max_sticker_size = 100 * 1024  # 100KB for stickers
-            if file_size > max_sticker_size:
-                raise ValueError(f"Sticker file too large ({file_size} bytes), maximum is {max_sticker_size} bytes")
-            
-            return await self.send_media(
-                jid=jid,
-                media_path=sticker_path,
-                media_type='sticker',
-                client=client,
-                **kwargs
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to send sticker: {str(e)}")
-            raise
+        # Validate sticker format
+        file_extension = _fast_suffix(sticker_path)
+        if file_extension != '.webp':
+            raise ValueError("Stickers must be in WebP format")
+        
+        # Validate file size (stickers are smaller)
+        file_size = await asyncio.to_thread(os.path.getsize, sticker_path)
+        max_sticker_size = 100 * 1024  # 100KB for stickers
+        if file_size > max_sticker_size:
+            raise ValueError(f"Sticker file too large ({file_size} bytes), maximum is {max_sticker_size} bytes")
+        
+        # Size and format are already validated above, so skip the duplicate
+        # stat and type resolution in send_media
+        return await self._send_media_core(jid, sticker_path, 'sticker', file_size, client, **kwargs)
     
     async def set_profile_picture(self, image_path: str, client=None) -> Dict[str, Any]:
         """
@@ -288,33 +663,38 @@ class MediaHandler:
             Dict[str, Any]: Update result
         """
         try:
-            # Validate image file
-            if not os.path.exists(image_path):
+            # Validate image file (single stat covers existence and size)
+            try:
+                file_stats = await asyncio.to_thread(os.stat, image_path)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"Image file not found: {image_path}")
             
-            file_extension = Path(image_path).suffix.lower()
+            file_extension = _fast_suffix(image_path)
             if file_extension not in self.supported_image_types:
                 raise ValueError(f"Unsupported image format: {file_extension}")
             
             # Check file size (profile pictures have limits)
-            file_size = os.path.getsize(image_path)
+            file_size = file_stats.st_size
             max_profile_size = 5 * 1024 * 1024  # 5MB for profile pictures
             if file_size > max_profile_size:
                 raise ValueError(f"Profile picture too large ({file_size} bytes), maximum is {max_profile_size} bytes")
             
-            # Prepare profile picture update data
+            # Prepare profile picture update data; one timestamp is shared
+            # between the payload and the result to avoid a second
+            # datetime.now() call per request
+            timestamp = datetime.now().isoformat()
             profile_data = {
                 'type': 'set_profile_picture',
                 'image_path': image_path,
                 'file_name': os.path.basename(image_path),
                 'file_size': file_size,
-                'mime_type': mimetypes.guess_type(image_path)[0],
-                'timestamp': datetime.now().isoformat()
+                'mime_type': _mime_for_path(image_path),
+                'timestamp': timestamp
             }
             
             result = await client.send_message(
                 jid='0@profile',  # Special JID for profile operations
-                message=json.dumps(profile_data),
+                message=_dumps(profile_data),
                 message_type='profile_update'
             )
             
@@ -324,11 +704,11 @@ class MediaHandler:
                 'status': 'updated',
                 'file_name': profile_data['file_name'],
                 'file_size': file_size,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
             
         except Exception as e:
-            logger.error(f"Failed to set profile picture: {str(e)}")
+            logger.error("Failed to set profile picture: %s", str(e))
             raise
     
     async def set_group_picture(self, group_id: str, image_path: str, client=None) -> Dict[str, Any]:
@@ -344,49 +724,53 @@ class MediaHandler:
             Dict[str, Any]: Update result
         """
         try:
-            # Validate image file
-            if not os.path.exists(image_path):
+            # Validate image file (single stat covers existence and size)
+            try:
+                file_stats = await asyncio.to_thread(os.stat, image_path)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"Image file not found: {image_path}")
             
-            file_extension = Path(image_path).suffix.lower()
+            file_extension = _fast_suffix(image_path)
             if file_extension not in self.supported_image_types:
                 raise ValueError(f"Unsupported image format: {file_extension}")
             
             # Check file size
-            file_size = os.path.getsize(image_path)
+            file_size = file_stats.st_size
             max_group_size = 5 * 1024 * 1024  # 5MB for group pictures
             if file_size > max_group_size:
                 raise ValueError(f"Group picture too large ({file_size} bytes), maximum is {max_group_size} bytes")
             
-            # Prepare group picture update data
+            # Prepare group picture update data; the timestamp is computed
+            # once and shared with the result
+            timestamp = datetime.now().isoformat()
             group_pic_data = {
                 'type': 'set_group_picture',
                 'group_id': group_id,
                 'image_path': image_path,
                 'file_name': os.path.basename(image_path),
                 'file_size': file_size,
-                'mime_type': mimetypes.guess_type(image_path)[0],
-                'timestamp': datetime.now().isoformat()
+                'mime_type': _mime_for_path(image_path),
+                'timestamp': timestamp
             }
             
             result = await client.send_message(
                 jid=group_id,
-                message=json.dumps(group_pic_data),
+                message=_dumps(group_pic_data),
                 message_type='group_update'
             )
             
-            logger.info(f"Group picture updated for group {group_id}")
+            logger.info("Group picture updated for group %s", group_id)
             
             return {
                 'status': 'updated',
                 'group_id': group_id,
                 'file_name': group_pic_data['file_name'],
                 'file_size': file_size,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
             
         except Exception as e:
-            logger.error(f"Failed to set group picture: {str(e)}")
+            logger.error("Failed to set group picture: %s", str(e))
             raise
     
     def _determine_media_type(self, media_path: str) -> Optional[str]:
@@ -399,20 +783,24 @@ class MediaHandler:
         Returns:
             Optional[str]: Media type or None if unsupported
         """
-        file_extension = Path(media_path).suffix.lower()
-        
-        if file_extension in self.supported_image_types:
-            return 'image'
-        elif file_extension in self.supported_video_types:
-            return 'video'
-        elif file_extension in self.supported_audio_types:
-            return 'audio'
-        elif file_extension in self.supported_document_types:
-            return 'document'
-        elif file_extension == '.webp':
-            return 'sticker'
-        else:
-            return None
+        return self._media_type_for_suffix(_fast_suffix(media_path))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _media_type_for_suffix(file_extension: str) -> Optional[str]:
+        """
+        Map an already-lowered file extension to its media type.
+        
+        Cached so repeated sends of the same extension cost one dict probe
+        instead of re-running the set membership checks.
+        
+        Args:
+            file_extension (str): Lowercased file extension (e.g. '.jpg')
+            
+        Returns:
+            Optional[str]: Media type or None if unsupported
+        """
+        return MediaHandler._ext_to_type.get(file_extension)
     
     def _get_max_file_size(self, media_type: str) -> int:
         """
@@ -424,15 +812,7 @@ class MediaHandler:
         Returns:
             int: Maximum file size in bytes
         """
-        size_limits = {
-            'image': 16 * 1024 * 1024,    # 16MB
-            'video': 16 * 1024 * 1024,    # 16MB
-            'audio': 16 * 1024 * 1024,    # 16MB
-            'document': 100 * 1024 * 1024, # 100MB
-            'sticker': 100 * 1024         # 100KB
-        }
-        
-        return size_limits.get(media_type, 16 * 1024 * 1024)  # Default 16MB
+        return _MAX_SIZES.get(media_type, 16 << 20)  # Default 16MB
     
     async def download_media(self, message_id: str, output_path: str, client=None) -> Dict[str, Any]:
         """
@@ -447,32 +827,33 @@ class MediaHandler:
             Dict[str, Any]: Download result
         """
         try:
-            # Prepare download request
+            # Prepare download request; one timestamp shared with the result
+            timestamp = datetime.now().isoformat()
             download_data = {
                 'type': 'download_media',
                 'message_id': message_id,
                 'output_path': output_path,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
             
             result = await client.send_message(
                 jid='0@download',  # Special JID for download operations
-                message=json.dumps(download_data),
+                message=_dumps(download_data),
                 message_type='download'
             )
             
             # In a real implementation, this would handle the actual download
-            logger.info(f"Media download requested for message {message_id}")
+            logger.info("Media download requested for message %s", message_id)
             
             return {
                 'status': 'downloading',
                 'message_id': message_id,
                 'output_path': output_path,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
             
         except Exception as e:
-            logger.error(f"Failed to download media: {str(e)}")
+            logger.error("Failed to download media: %s", str(e))
             raise
     
     async def get_media_info(self, media_path: str) -> Dict[str, Any]:
@@ -486,18 +867,19 @@ class MediaHandler:
             Dict[str, Any]: Media information
         """
         try:
-            if not os.path.exists(media_path):
+            try:
+                file_stats = await asyncio.to_thread(os.stat, media_path)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"Media file not found: {media_path}")
             
-            file_stats = os.stat(media_path)
-            file_extension = Path(media_path).suffix.lower()
+            file_extension = _fast_suffix(media_path)
             
             media_info = {
                 'file_path': media_path,
                 'file_name': os.path.basename(media_path),
                 'file_size': file_stats.st_size,
                 'file_extension': file_extension,
-                'mime_type': mimetypes.guess_type(media_path)[0],
+                'mime_type': _mime_for_path(media_path),
                 'media_type': self._determine_media_type(media_path),
                 'modified_time': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
             }
@@ -519,9 +901,44 @@ class MediaHandler:
             return media_info
             
         except Exception as e:
-            logger.error(f"Failed to get media info: {str(e)}")
+            logger.error("Failed to get media info: %s", str(e))
             raise
     
+    def iter_media_in_dir(self, dirpath: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over supported media files in a directory.
+        
+        Uses os.scandir so size and mtime come from the cached directory
+        entry instead of a separate stat call per file.
+        
+        Args:
+            dirpath (str): Directory to scan
+            
+        Yields:
+            Dict[str, Any]: Media information for each supported file
+        """
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                
+                file_extension = _fast_suffix(entry.name)
+                media_type = self._media_type_for_suffix(file_extension)
+                if not media_type:
+                    continue
+                
+                file_stats = entry.stat()
+                
+                yield {
+                    'file_path': entry.path,
+                    'file_name': entry.name,
+                    'file_size': file_stats.st_size,
+                    'file_extension': file_extension,
+                    'mime_type': _mime_for_path(entry.name),
+                    'media_type': media_type,
+                    'modified_time': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+                }
+    
     def validate_media_file(self, media_path: str, expected_type: str = None) -> bool:
         """
         Validate if a media file is supported and valid.
@@ -534,7 +951,9 @@ class MediaHandler:
             bool: True if file is valid
         """
         try:
-            if not os.path.exists(media_path):
+            try:
+                file_stats = os.stat(media_path)
+            except OSError:
                 return False
             
             media_type = self._determine_media_type(media_path)
@@ -545,9 +964,8 @@ class MediaHandler:
                 return False
             
             # Check file size
-            file_size = os.path.getsize(media_path)
             max_size = self._get_max_file_size(media_type)
-            if file_size > max_size:
+            if file_stats.st_size > max_size:
                 return False
             
             return True
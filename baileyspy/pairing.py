@@ -8,15 +8,128 @@ Author: MiniMax Agent
 """
 
 import asyncio
+import collections
+import functools
+import heapq
 import logging
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import json
-import random
-import string
+import re
+import secrets
+import time
+
+try:
+    import orjson
+except ImportError:  # optional dependency; fall back to stdlib json
+    orjson = None
+
+try:
+    import msgspec
+    _msgpack_encoder = msgspec.msgpack.Encoder()
+except ImportError:  # optional dependency; msgpack framing disabled
+    _msgpack_encoder = None
 
 logger = logging.getLogger(__name__)
 
+# Baileys pairing codes use the uppercase letters A-F. The translation
+# table maps raw CSPRNG bytes onto that alphabet in C; byte values >= 252
+# are rejected first so every letter stays equally likely (252 = 42 * 6).
+_CODE_ALPHABET = 'ABCDEF'
+_CODE_TABLE = bytes(ord(_CODE_ALPHABET[b % 6]) for b in range(256))
+_CODE_REJECT = bytes(range(252, 256))
+
+# Phone-number cleanup runs in re's C engine rather than a per-character
+# Python filter callback
+_NON_DIGIT = re.compile(r'\D')
+
+# Pairing-code validation: hyphen strip and alphabet/length check both
+# run in C (translate table + compiled pattern)
+_HYPHEN_TABLE = str.maketrans('', '', '-')
+_CODE_RE = re.compile(r'\A[A-F]{4,}\Z')
+
+# Special JID for pairing operations, shared by every control frame
+_PAIRING_JID = '0@pairing'
+
+
+@functools.lru_cache(maxsize=None)
+def _type_segment(frame_type: str) -> str:
+    """Constant ',"type":...' JSON segment for a control frame type."""
+    return f',"type":"{frame_type}"'
+
+
+def _now_iso() -> str:
+    """Format the current local time as an ISO-8601 string without
+    constructing a datetime object per call."""
+    t = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(t)) + f".{int(t % 1 * 1e6):06d}"
+
+
+if orjson is not None:
+    def _dumps(obj) -> bytes:
+        """Serialize a pairing payload with orjson.
+        
+        Returns bytes directly, skipping the str round-trip since the
+        connection layer accepts pre-encoded bytes.
+        """
+        return orjson.dumps(obj)
+else:
+    _dumps = json.dumps
+
+
+@dataclass(slots=True)
+class PairingRecord:
+    """
+    Slot-backed record for one pairing request.
+    
+    The verify path reads several fields per call; slot attribute loads
+    avoid the per-key hashing of a dict record, and memory per entry
+    drops severalfold when many codes are tracked.
+    """
+    pairing_id: str
+    number: str
+    code: str
+    status: str
+    requested_at: str
+    expires_at: str
+    expires_at_epoch: float
+    prefix: Any = None
+    timer: Any = None
+    verified_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    revoked_at: Optional[str] = None
+    auth_tokens: Optional[Dict[str, str]] = None
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the external-facing fields as a plain dict."""
+        info = {
+            'pairing_id': self.pairing_id,
+            'number': self.number,
+            'code': self.code,
+            'status': self.status,
+            'requested_at': self.requested_at,
+            'expires_at': self.expires_at
+        }
+        if self.verified_at is not None:
+            info['verified_at'] = self.verified_at
+        if self.completed_at is not None:
+            info['completed_at'] = self.completed_at
+        if self.revoked_at is not None:
+            info['revoked_at'] = self.revoked_at
+        if self.auth_tokens is not None:
+            info['auth_tokens'] = self.auth_tokens
+        return info
+
 
 class PairingManager:
     """
@@ -29,14 +142,147 @@ class PairingManager:
     - Querying pairing status
     """
     
-    def __init__(self):
-        """Initialize PairingManager."""
+    __slots__ = (
+        'pairing_codes', 'active_pairings', 'is_pairing_active',
+        '_status_counts', '_expiry_heap', 'serialization', '_message_type',
+        'batch_sends', '_pending', '_pending_flush_threshold',
+        '_code_pool', '_pool_task',
+    )
+    
+    def __init__(self, serialization: str = 'json', batch_sends: bool = False):
+        """
+        Initialize PairingManager.
+        
+        Args:
+            serialization (str): Wire format for pairing control messages
+                ('json' or 'msgpack'). msgpack frames are smaller and
+                faster to parse but require the optional msgspec dependency.
+            batch_sends (bool): Buffer control frames and flush them in
+                batched requests instead of one write per frame. Useful for
+                bulk device enrollment; requires json serialization.
+        """
         self.pairing_codes = {}
         self.active_pairings = {}
         self.is_pairing_active = False
+        # Incrementally maintained status counts so statistics are O(1)
+        # instead of a full table scan per call
+        self._status_counts = collections.Counter()
+        # Min-heap of (expiry_epoch, pairing_id): expiry sweeps pop only
+        # already-expired entries instead of scanning the whole table
+        self._expiry_heap = []
+        
+        if serialization == 'msgpack' and _msgpack_encoder is None:
+            logger.warning("msgspec not installed, falling back to json serialization")
+            serialization = 'json'
+        self.serialization = serialization
+        # Tagged message type lets the receiver route to the right decoder
+        self._message_type = 'pairing-msgpack' if serialization == 'msgpack' else 'pairing'
+        
+        if batch_sends and serialization != 'json':
+            logger.warning("Batched sends require json serialization, disabling")
+            batch_sends = False
+        self.batch_sends = batch_sends
+        self._pending = []
+        self._pending_flush_threshold = 32
+        
+        # Pre-generated default-length codes so bursts of requests pop from
+        # the pool instead of hitting the CSPRNG on the request path
+        self._code_pool = collections.deque(maxlen=64)
+        self._pool_task = None
         
         logger.info("PairingManager initialized")
     
+    def _encode(self, payload: Dict[str, Any]):
+        """Encode a pairing control payload in the configured wire format."""
+        if self.serialization == 'msgpack':
+            return _msgpack_encoder.encode(payload)
+        return _dumps(payload)
+    
+    async def _send_control(self, payload, client):
+        """Ship one control frame, or buffer it when batching is enabled."""
+        if self.batch_sends:
+            self._pending.append(payload)
+            if len(self._pending) >= self._pending_flush_threshold:
+                await self.flush_pending(client)
+            return
+        
+        await client.send_message(
+            jid=_PAIRING_JID,
+            message=payload,
+            message_type=self._message_type
+        )
+    
+    async def flush_pending(self, client):
+        """
+        Flush buffered pairing control frames as one batched request.
+        
+        Coalescing frames amortizes the per-write round-trip across the
+        batch, which matters during bulk device enrollment.
+        
+        Args:
+            client: Connection manager instance
+        """
+        if not self._pending:
+            return
+        
+        frames = self._pending
+        self._pending = []
+        
+        if isinstance(frames[0], bytes):
+            payload = b'[' + b','.join(frames) + b']'
+        else:
+            payload = '[' + ','.join(frames) + ']'
+        
+        await client.send_batch(payload, len(frames))
+    
+    def _expire_record(self, pairing_id: str):
+        """Timer callback: mark a still-pending pairing code as expired."""
+        record = self.pairing_codes.get(pairing_id)
+        if record is not None:
+            record.timer = None
+            if record.status in ('requested', 'verified'):
+                self._set_status(pairing_id, 'expired')
+                logger.info(f"Pairing code for request {pairing_id} expired")
+    
+    @staticmethod
+    def _cancel_timer(record: 'PairingRecord'):
+        """Cancel a record's pending expiry timer, if any."""
+        if record.timer is not None:
+            record.timer.cancel()
+            record.timer = None
+    
+    def _set_status(self, pairing_id: str, new_status: str):
+        """Transition a pairing record's status, keeping the counters in sync."""
+        record = self.pairing_codes[pairing_id]
+        self._status_counts[record.status] -= 1
+        self._status_counts[new_status] += 1
+        record.status = new_status
+    
+    def _control_payload(self, pairing_id: str, pairing_info: 'PairingRecord', frame_type: str,
+                         extra_json: str = '', extra_fields: Dict[str, Any] = None):
+        """
+        Build a pairing control frame, reusing the cached serialized prefix.
+        
+        The pairing_id/number part of every downstream frame is identical,
+        so it is serialized once at request time and only the per-call
+        type/timestamp tail is appended here. Falls back to a full encode
+        when no prefix is cached or msgpack framing is active.
+        """
+        prefix = pairing_info.prefix if self.serialization == 'json' else None
+        if prefix is None:
+            data = {
+                'type': frame_type,
+                'pairing_id': pairing_id,
+                'number': pairing_info.number
+            }
+            if extra_fields:
+                data.update(extra_fields)
+            data['timestamp'] = _now_iso()
+            return self._encode(data)
+        
+        tail = _type_segment(frame_type) + f'{extra_json},"timestamp":"{_now_iso()}"}}'
+        return prefix + (tail.encode() if isinstance(prefix, bytes) else tail)
+    
     async def request_pairing_code(self, number: str, code: str = None, client=None) -> Dict[str, Any]:
         """
         Request a custom pairing code for device linking.
@@ -55,7 +301,7 @@ class PairingManager:
                 raise ValueError("Phone number cannot be empty")
             
             # Clean number (remove non-digits)
-            clean_number = ''.join(filter(str.isdigit, number))
+            clean_number = _NON_DIGIT.sub('', number)
             if len(clean_number) < 8:
                 raise ValueError("Phone number appears to be too short")
             
@@ -66,30 +312,39 @@ class PairingManager:
                 self._validate_pairing_code(code)
             
             # Prepare pairing request
+            now_iso = _now_iso()
             pairing_data = {
                 'type': 'request_pairing',
                 'number': clean_number,
                 'code': code,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
             
             # In a real implementation, this would use Baileys's requestPairingCode method
-            result = await client.send_message(
-                jid='0@pairing',  # Special JID for pairing operations
-                message=json.dumps(pairing_data),
-                message_type='pairing'
-            )
+            await self._send_control(self._encode(pairing_data), client)
             
             # Track the pairing request
-            pairing_id = f"pair_{int(asyncio.get_event_loop().time())}"
-            self.pairing_codes[pairing_id] = {
-                'pairing_id': pairing_id,
-                'number': clean_number,
-                'code': code,
-                'status': 'requested',
-                'requested_at': datetime.now().isoformat(),
-                'expires_at': self._calculate_expiry()
-            }
+            pairing_id = f"pair_{time.monotonic_ns():x}"
+            expires_at, expires_at_epoch = self._calculate_expiry()
+            self.pairing_codes[pairing_id] = PairingRecord(
+                pairing_id=pairing_id,
+                number=clean_number,
+                code=code,
+                status='requested',
+                requested_at=now_iso,
+                expires_at=expires_at,
+                expires_at_epoch=expires_at_epoch,
+                # Serialized once here; downstream control frames append
+                # only their type/timestamp tail
+                prefix=_dumps({'pairing_id': pairing_id, 'number': clean_number})[:-1]
+            )
+            self._status_counts['requested'] += 1
+            heapq.heappush(self._expiry_heap, (expires_at_epoch, pairing_id))
+            # Expire the code exactly when it lapses instead of waiting
+            # for the next cleanup_expired_codes() sweep
+            self.pairing_codes[pairing_id].timer = asyncio.get_running_loop().call_later(
+                expires_at_epoch - time.time(), self._expire_record, pairing_id
+            )
             
             logger.info(f"Pairing code {code} requested for number {clean_number}")
             
@@ -98,7 +353,7 @@ class PairingManager:
                 'pairing_id': pairing_id,
                 'number': clean_number,
                 'pairing_code': code,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
             
         except Exception as e:
@@ -116,11 +371,12 @@ class PairingManager:
         Returns:
             str: Generated pairing code
         """
-        # Baileys typically uses uppercase letters A-F for pairing codes
-        characters = 'ABCDEF'
-        
-        # Generate random code
-        code = ''.join(random.choices(characters, k=length))
+        # Draw from the CSPRNG (an auth code should not come from the
+        # Mersenne Twister) and map bytes to A-F entirely in C
+        raw = b''
+        while len(raw) < length:
+            raw += secrets.token_bytes(length + 8).translate(_CODE_TABLE, _CODE_REJECT)
+        code = raw[:length].decode('ascii')
         
         # Format with hyphen if requested
         if format_with_hyphen and length >= 4:
@@ -138,20 +394,16 @@ class PairingManager:
         Raises:
             ValueError: If code format is invalid
         """
-        if not code or len(code) < 4:
-            raise ValueError("Pairing code must be at least 4 characters")
+        clean_code = code.translate(_HYPHEN_TABLE).upper() if code else ''
         
-        # Remove hyphens for validation
-        clean_code = code.replace('-', '').upper()
-        
-        # Check if code contains only valid characters (A-F)
-        valid_chars = set('ABCDEF')
-        if not all(char in valid_chars for char in clean_code):
+        if not _CODE_RE.match(clean_code):
+            if len(clean_code) < 4:
+                raise ValueError("Pairing code must be at least 4 characters")
             raise ValueError("Pairing code must contain only characters A-F")
         
         return clean_code
     
-    def _calculate_expiry(self, minutes: int = 60) -> str:
+    def _calculate_expiry(self, minutes: int = 60):
         """
         Calculate expiry time for pairing code.
         
@@ -159,10 +411,12 @@ class PairingManager:
             minutes (int): Minutes until expiry
             
         Returns:
-            str: ISO format expiry timestamp
+            tuple: (ISO format expiry timestamp, epoch float). The epoch is
+                kept alongside so hot-path expiry checks are a float compare
+                instead of a fromisoformat parse.
         """
-        expiry_time = datetime.now().timestamp() + (minutes * 60)
-        return datetime.fromtimestamp(expiry_time).isoformat()
+        expiry_epoch = time.time() + (minutes * 60)
+        return datetime.fromtimestamp(expiry_epoch).isoformat(), expiry_epoch
     
     async def verify_pairing_code(self, pairing_id: str, code: str, client=None) -> Dict[str, Any]:
         """
@@ -182,45 +436,40 @@ class PairingManager:
             
             pairing_info = self.pairing_codes[pairing_id]
             
-            # Check if pairing code has expired
-            expiry_time = datetime.fromisoformat(pairing_info['expires_at'])
-            if datetime.now() > expiry_time:
-                self.pairing_codes[pairing_id]['status'] = 'expired'
+            # Check if pairing code has expired (float compare; the ISO
+            # string is only for external consumers)
+            if time.time() > pairing_info.expires_at_epoch:
+                self._set_status(pairing_id, 'expired')
                 raise ValueError("Pairing code has expired")
             
             # Validate the provided code
             provided_code = self._validate_pairing_code(code)
-            expected_code = pairing_info['code'].replace('-', '').upper()
+            expected_code = pairing_info.code.replace('-', '').upper()
             
             if provided_code != expected_code:
                 raise ValueError("Invalid pairing code")
             
             # Prepare verification request
-            verify_data = {
-                'type': 'verify_pairing',
-                'pairing_id': pairing_id,
-                'number': pairing_info['number'],
-                'code': provided_code,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            result = await client.send_message(
-                jid='0@pairing',
-                message=json.dumps(verify_data),
-                message_type='pairing'
+            payload = self._control_payload(
+                pairing_id, pairing_info, 'verify_pairing',
+                extra_json=f',"code":"{provided_code}"',
+                extra_fields={'code': provided_code}
             )
             
+            await self._send_control(payload, client)
+            
             # Update pairing status
-            self.pairing_codes[pairing_id]['status'] = 'verified'
-            self.pairing_codes[pairing_id]['verified_at'] = datetime.now().isoformat()
+            now_iso = _now_iso()
+            self._set_status(pairing_id, 'verified')
+            pairing_info.verified_at = now_iso
             
             logger.info(f"Pairing code verified for request {pairing_id}")
             
             return {
                 'status': 'verified',
                 'pairing_id': pairing_id,
-                'number': pairing_info['number'],
-                'timestamp': datetime.now().isoformat()
+                'number': pairing_info.number,
+                'timestamp': now_iso
             }
             
         except Exception as e:
@@ -244,41 +493,36 @@ class PairingManager:
             
             pairing_info = self.pairing_codes[pairing_id]
             
-            if pairing_info['status'] != 'verified':
+            if pairing_info.status != 'verified':
                 raise ValueError("Pairing code must be verified before completion")
             
             # Prepare completion request
-            complete_data = {
-                'type': 'complete_pairing',
-                'pairing_id': pairing_id,
-                'number': pairing_info['number'],
-                'timestamp': datetime.now().isoformat()
-            }
+            payload = self._control_payload(pairing_id, pairing_info, 'complete_pairing')
             
-            result = await client.send_message(
-                jid='0@pairing',
-                message=json.dumps(complete_data),
-                message_type='pairing'
-            )
+            await self._send_control(payload, client)
             
             # Simulate successful pairing response
             auth_tokens = {
-                'auth_token': f"auth_{int(asyncio.get_event_loop().time())}",
-                'device_id': f"device_{int(asyncio.get_event_loop().time())}",
-                'phone_number': pairing_info['number']
+                'auth_token': f"auth_{time.monotonic_ns():x}",
+                'device_id': f"device_{time.monotonic_ns():x}",
+                'phone_number': pairing_info.number
             }
             
+            # One timestamp per completion, reused across all records
+            now_iso = _now_iso()
+            
             # Update pairing status
-            self.pairing_codes[pairing_id]['status'] = 'completed'
-            self.pairing_codes[pairing_id]['completed_at'] = datetime.now().isoformat()
-            self.pairing_codes[pairing_id]['auth_tokens'] = auth_tokens
+            self._cancel_timer(pairing_info)
+            self._set_status(pairing_id, 'completed')
+            pairing_info.completed_at = now_iso
+            pairing_info.auth_tokens = auth_tokens
             
             # Create active pairing record
             device_id = auth_tokens['device_id']
             self.active_pairings[device_id] = {
                 'device_id': device_id,
-                'phone_number': pairing_info['number'],
-                'paired_at': datetime.now().isoformat(),
+                'phone_number': pairing_info.number,
+                'paired_at': now_iso,
                 'auth_token': auth_tokens['auth_token'],
                 'pairing_id': pairing_id
             }
@@ -291,16 +535,16 @@ class PairingManager:
                 'status': 'completed',
                 'pairing_id': pairing_id,
                 'device_id': device_id,
-                'phone_number': pairing_info['number'],
+                'phone_number': pairing_info.number,
                 'auth_tokens': auth_tokens,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
             
         except Exception as e:
             logger.error(f"Failed to complete pairing: {str(e)}")
             raise
     
-    async def get_pairing_status(self, pairing_id: str) -> Dict[str, Any]:
+    async def get_pairing_status(self, pairing_id: str) -> 'PairingRecord':
         """
         Get the status of a pairing request.
         
@@ -308,22 +552,21 @@ class PairingManager:
             pairing_id (str): ID of the pairing request
             
         Returns:
-            Dict[str, Any]: Pairing status information
+            PairingRecord: Live view of the pairing record. Supports
+                dict-style access; call .to_dict() for a plain copy.
         """
         try:
             if pairing_id not in self.pairing_codes:
                 raise ValueError(f"Pairing request {pairing_id} not found")
             
-            pairing_info = self.pairing_codes[pairing_id].copy()
+            record = self.pairing_codes[pairing_id]
             
             # Check if code has expired
-            if pairing_info['status'] in ['requested', 'verified']:
-                expiry_time = datetime.fromisoformat(pairing_info['expires_at'])
-                if datetime.now() > expiry_time:
-                    pairing_info['status'] = 'expired'
-                    self.pairing_codes[pairing_id]['status'] = 'expired'
+            if record.status in ('requested', 'verified'):
+                if time.time() > record.expires_at_epoch:
+                    self._set_status(pairing_id, 'expired')
             
-            return pairing_info
+            return record
             
         except Exception as e:
             logger.error(f"Failed to get pairing status: {str(e)}")
@@ -361,30 +604,23 @@ class PairingManager:
             pairing_info = self.pairing_codes[pairing_id]
             
             # Prepare revocation request
-            revoke_data = {
-                'type': 'revoke_pairing',
-                'pairing_id': pairing_id,
-                'number': pairing_info['number'],
-                'timestamp': datetime.now().isoformat()
-            }
+            payload = self._control_payload(pairing_id, pairing_info, 'revoke_pairing')
             
-            await client.send_message(
-                jid='0@pairing',
-                message=json.dumps(revoke_data),
-                message_type='pairing'
-            )
+            await self._send_control(payload, client)
             
             # Update pairing status
-            self.pairing_codes[pairing_id]['status'] = 'revoked'
-            self.pairing_codes[pairing_id]['revoked_at'] = datetime.now().isoformat()
+            now_iso = _now_iso()
+            self._cancel_timer(pairing_info)
+            self._set_status(pairing_id, 'revoked')
+            pairing_info.revoked_at = now_iso
             
             logger.info(f"Pairing request {pairing_id} revoked")
             
             return {
                 'status': 'revoked',
                 'pairing_id': pairing_id,
-                'number': pairing_info['number'],
-                'timestamp': datetime.now().isoformat()
+                'number': pairing_info.number,
+                'timestamp': now_iso
             }
             
         except Exception as e:
@@ -395,26 +631,47 @@ class PairingManager:
         """
         Generate a default pairing code for convenience.
         
+        Default-length codes are served from a pre-generated pool that a
+        background task keeps topped up, so bursts of calls do not pay
+        the CSPRNG cost on the request path.
+        
         Args:
             length (int): Length of the code
             
         Returns:
             str: Generated pairing code
         """
-        return self._generate_pairing_code(length)
+        if length == 8 and self._code_pool:
+            code = self._code_pool.popleft()
+        else:
+            code = self._generate_pairing_code(length)
+        
+        self._ensure_pool_refill()
+        return code
+    
+    def _ensure_pool_refill(self):
+        """Start the background pool refill task if it is not running."""
+        if self._pool_task is None or self._pool_task.done():
+            self._pool_task = asyncio.get_running_loop().create_task(self._refill_pool())
+    
+    async def _refill_pool(self):
+        """Top the code pool back up, yielding to the loop between codes."""
+        while len(self._code_pool) < self._code_pool.maxlen:
+            self._code_pool.append(self._generate_pairing_code())
+            await asyncio.sleep(0)
     
     async def cleanup_expired_codes(self):
         """Clean up expired pairing codes."""
         try:
-            current_time = datetime.now()
+            now = time.time()
             expired_count = 0
             
-            for pairing_id, pairing_info in list(self.pairing_codes.items()):
-                if pairing_info['status'] in ['requested', 'verified']:
-                    expiry_time = datetime.fromisoformat(pairing_info['expires_at'])
-                    if current_time > expiry_time:
-                        self.pairing_codes[pairing_id]['status'] = 'expired'
-                        expired_count += 1
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                _, pairing_id = heapq.heappop(self._expiry_heap)
+                record = self.pairing_codes.get(pairing_id)
+                if record and record.status in ('requested', 'verified'):
+                    self._set_status(pairing_id, 'expired')
+                    expired_count += 1
             
             if expired_count > 0:
                 logger.info(f"Cleaned up {expired_count} expired pairing codes")
@@ -430,22 +687,13 @@ class PairingManager:
             Dict[str, Any]: Pairing statistics
         """
         try:
-            total_requests = len(self.pairing_codes)
-            completed_requests = sum(
-                1 for p in self.pairing_codes.values() 
-                if p['status'] == 'completed'
-            )
-            expired_requests = sum(
-                1 for p in self.pairing_codes.values() 
-                if p['status'] == 'expired'
-            )
-            
             return {
-                'total_requests': total_requests,
-                'completed_requests': completed_requests,
-                'expired_requests': expired_requests,
+                'total_requests': len(self.pairing_codes),
+                'completed_requests': self._status_counts['completed'],
+                'expired_requests': self._status_counts['expired'],
                 'active_pairings': len(self.active_pairings),
-                'is_pairing_active': self.is_pairing_active
+                'is_pairing_active': self.is_pairing_active,
+                'code_pool_size': len(self._code_pool)
             }
             
         except Exception as e:
@@ -455,9 +703,13 @@ class PairingManager:
     async def reset_pairing_state(self):
         """Reset pairing state and clear all records."""
         try:
+            for record in self.pairing_codes.values():
+                self._cancel_timer(record)
             self.pairing_codes = {}
             self.active_pairings = {}
             self.is_pairing_active = False
+            self._status_counts.clear()
+            self._expiry_heap.clear()
             
             logger.info("Pairing state reset")
             
@@ -8,15 +8,219 @@ Author: MiniMax Agent
 """
 
 import asyncio
-import hashlib
+import functools
 import logging
 import re
+import secrets
+import time
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timedelta
+from urllib.parse import quote, unquote
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; the per-call re.match/findall/search variants
+# pay pattern-cache hashing on every invocation
+_JID_RE = re.compile(r'^(\d{8,15})@s\.whatsapp\.net$')
+# Leading-match like the baseline: trailing text ("30 minutes", "1h30m")
+# is tolerated and only the leading number/unit is read
+_DURATION_RE = re.compile(r'(\d+)([hms]?)')
+_MENTION_RE = re.compile(r'@(\d+)')
+
+# Deletes control characters (except \t\n\r) in one C-level pass
+_CTRL_TRANSLATE = {c: None for c in range(32) if c not in (9, 10, 13)}
+
+# Strips every non-digit code point in one compiled-regex pass
+_NON_DIGIT = re.compile(r'\D')
+
+# Shared mask source; slicing it avoids a fresh '*' * n allocation per call
+_STARS = '*' * 32
+
+# Shared read-only lookup tables, built once at import instead of per
+# call (or per Utils instance for the country codes)
+_COUNTRY_CODES = MappingProxyType({
+    'US': '1', 'CA': '1', 'GB': '44', 'DE': '49', 'FR': '33', 'IT': '39',
+    'ES': '34', 'RU': '7', 'IN': '91', 'CN': '86', 'JP': '81', 'KR': '82',
+    'AU': '61', 'BR': '55', 'MX': '52', 'AR': '54', 'CL': '56', 'CO': '57',
+    'PE': '51', 'VE': '58', 'PH': '63', 'ID': '62', 'TH': '66', 'VN': '84',
+    'MY': '60', 'SG': '65', 'TW': '886', 'HK': '852', 'NZ': '64'
+})
+
+_PRIORITY_MAP = MappingProxyType({
+    'text': 5,
+    'image': 6,
+    'video': 7,
+    'audio': 4,
+    'document': 8,
+    'location': 9,
+    'sticker': 3,
+    'system': 10,
+    'call': 10,
+    'notification': 7
+})
+
+_STATUS_EMOJIS = MappingProxyType({
+    'online': '🟢',
+    'offline': '⚫',
+    'away': '🟡',
+    'busy': '🔴',
+    'typing': '⌨️',
+    'recording': '🎤',
+    'connecting': '🔄',
+    'connected': '✅',
+    'disconnected': '❌',
+    'error': '❌',
+    'success': '✅',
+    'warning': '⚠️',
+    'info': 'ℹ️'
+})
+
+# Common spam indicators, scanned with a single multi-pattern pass
+_SPAM_INDICATORS = (
+    'click here', 'buy now', 'limited time', 'act fast', 'free money',
+    'congratulations', 'you won', 'prize', 'lottery', 'win money',
+    'urgent', 'exclusive offer', 'special promotion', 'money back'
+)
+
+if ahocorasick is not None:
+    _SPAM_AC = ahocorasick.Automaton()
+    for _indicator in _SPAM_INDICATORS:
+        _SPAM_AC.add_word(_indicator, _indicator)
+    _SPAM_AC.make_automaton()
+    _SPAM_RE = None
+else:
+    # One alternation pattern scans the text once instead of running a
+    # substring search per indicator; the lookahead reports overlapping
+    # hits like the automaton does
+    _SPAM_AC = None
+    _SPAM_RE = re.compile('(?=(' + '|'.join(map(re.escape, _SPAM_INDICATORS)) + '))')
+
+
+def _scan_signals_bytes(buf: bytes, min_run: int):
+    """Fused signal scan over a bytes buffer.
+
+    Iterating bytes yields small cached ints, so the comparisons avoid
+    per-character string objects entirely. Only valid for ASCII input,
+    where one byte is one character.
+    """
+    bangs = questions = 0
+    run = 1
+    has_run = False
+    prev = -1
+    for b in buf:
+        if b == prev:
+            run += 1
+            if run >= min_run:
+                has_run = True
+        else:
+            run = 1
+            prev = b
+        if b == 33:
+            bangs += 1
+        elif b == 63:
+            questions += 1
+    return bangs, questions, has_run
+
+
+def _spam_signals(text: str, min_run: int = 5):
+    """Collect the per-character spam signals in one pass.
+
+    Counts '!' and '?' occurrences and checks for min_run identical
+    adjacent characters in a single walk over the text, instead of one
+    scan per signal. The run check replaces the old (.)\\1{4,} regex —
+    a counting compare beats dispatching the backtracking engine for a
+    pattern this trivial. ASCII text (the common case) takes the
+    integer byte-scan path.
+    """
+    if text.isascii():
+        return _scan_signals_bytes(text.encode('ascii'), min_run)
+
+    bangs = questions = 0
+    run = 1
+    has_run = False
+    prev = ''
+    for ch in text:
+        if ch == prev:
+            run += 1
+            if run >= min_run:
+                has_run = True
+        else:
+            run = 1
+            prev = ch
+        if ch == '!':
+            bangs += 1
+        elif ch == '?':
+            questions += 1
+    return bangs, questions, has_run
+
+
+@functools.lru_cache(maxsize=1024)
+def _jid_valid(jid: str) -> bool:
+    """Memoized JID validation core.
+
+    Conversation loops re-validate the same handful of JIDs over and
+    over; a bounded cache turns repeats into one hash lookup.
+    """
+    # Cheap suffix/length gate rejects most invalid inputs without
+    # touching the regex engine
+    if not jid.endswith('@s.whatsapp.net'):
+        return False
+    if not 8 <= len(jid) - 15 <= 15:
+        return False
+
+    # The {8,15} bound folds the number-length check into the
+    # pattern, so no split/isdigit follow-up is needed
+    return _JID_RE.match(jid) is not None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_duration(duration_str: str) -> int:
+    """Parse a normalized duration string to seconds, memoized.
+
+    Durations come from a small fixed vocabulary ("30s", "5m", "1h"),
+    so repeat calls skip the regex entirely.
+    """
+    # First-character gate short-circuits obviously invalid strings
+    # before the regex runs, without rejecting trailing text the
+    # leading match would tolerate
+    if not duration_str or not duration_str[0].isdigit():
+        raise ValueError(f"Invalid duration format: {duration_str}")
+
+    match = _DURATION_RE.match(duration_str)
+    if not match:
+        raise ValueError(f"Invalid duration format: {duration_str}")
+
+    number = int(match.group(1))
+    unit = match.group(2)
+
+    if unit == 'h':
+        return number * 3600
+    if unit == 'm':
+        return number * 60
+    return number
+
+
+@functools.lru_cache(maxsize=256)
+def _format_timestamp(timestamp: Union[str, int, float]) -> str:
+    """Format a string/epoch timestamp for display, memoized."""
+    if isinstance(timestamp, str):
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    else:
+        dt = datetime.fromtimestamp(timestamp)
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
 
 class Utils:
     """
@@ -30,16 +234,23 @@ class Utils:
     - Security and encryption utilities
     """
     
+    # Type -> formatter dispatch table; one hash lookup replaces the
+    # elif chain's linear string comparisons
+    _FORMATTERS = {
+        'text': lambda d: d.get('content', ''),
+        'image': lambda d: f"[Image] {d.get('caption', '')}",
+        'video': lambda d: f"[Video] {d.get('caption', '')}",
+        'audio': lambda d: f"[Audio] {d.get('caption', '')}",
+        'document': lambda d: f"[Document] {d.get('file_name', 'Document')}",
+        'location': lambda d: f"[Location] {d.get('name', 'Location')}",
+    }
+
     def __init__(self):
         """Initialize Utils."""
-        self.country_codes = {
-            'US': '1', 'CA': '1', 'GB': '44', 'DE': '49', 'FR': '33', 'IT': '39',
-            'ES': '34', 'RU': '7', 'IN': '91', 'CN': '86', 'JP': '81', 'KR': '82',
-            'AU': '61', 'BR': '55', 'MX': '52', 'AR': '54', 'CL': '56', 'CO': '57',
-            'PE': '51', 'VE': '58', 'PH': '63', 'ID': '62', 'TH': '66', 'VN': '84',
-            'MY': '60', 'SG': '65', 'TW': '886', 'HK': '852', 'NZ': '64'
-        }
-        
+        # Shared read-only view; kept as an attribute for callers that
+        # reach for utils.country_codes directly
+        self.country_codes = _COUNTRY_CODES
+
         logger.info("Utils initialized")
     
     def format_phone_number(self, phone_number: str, country_code: str = None, add_suffix: bool = True) -> str:
@@ -55,15 +266,17 @@ class Utils:
             str: Formatted phone number
         """
         try:
+            # Fast path: already-clean digits with no country code to
+            # prepend — the common case — skip the translate pass
+            if add_suffix and country_code is None and phone_number.isdigit():
+                return f"{phone_number}@s.whatsapp.net"
+
             # Remove all non-digits
-            clean_number = ''.join(filter(str.isdigit, phone_number))
-            
+            clean_number = _NON_DIGIT.sub('', phone_number)
+
             # Add country code if provided
             if country_code and len(clean_number) <= 10:
-                if country_code.upper() in self.country_codes:
-                    clean_number = self.country_codes[country_code.upper()] + clean_number
-                else:
-                    clean_number = country_code + clean_number
+                clean_number = self.country_codes.get(country_code.upper(), country_code) + clean_number
             
             # Add WhatsApp suffix if requested
             if add_suffix:
@@ -85,23 +298,9 @@ class Utils:
         Returns:
             bool: True if valid JID
         """
-        try:
-            # Basic WhatsApp JID pattern
-            jid_pattern = r'^\d+@s\.whatsapp\.net$'
-            
-            # Check basic format
-            if not re.match(jid_pattern, jid):
-                return False
-            
-            # Check if number part is valid (digits only, reasonable length)
-            number_part = jid.split('@')[0]
-            if not number_part.isdigit() or len(number_part) < 8 or len(number_part) > 15:
-                return False
-            
-            return True
-            
-        except Exception:
-            return False
+        # Pure predicate: the string checks and regex cannot raise, so
+        # no try/except frame is paid per call
+        return isinstance(jid, str) and _jid_valid(jid)
     
     def is_group_jid(self, jid: str) -> bool:
         """
@@ -113,7 +312,7 @@ class Utils:
         Returns:
             bool: True if it's a group JID
         """
-        return '@g.us' in jid
+        return isinstance(jid, str) and '@g.us' in jid
     
     def extract_number_from_jid(self, jid: str) -> Optional[str]:
         """
@@ -145,27 +344,10 @@ class Utils:
         """
         try:
             message_type = message_data.get('type', 'unknown')
-            content = message_data.get('content', '')
-            
-            if message_type == 'text':
-                return content
-            elif message_type == 'image':
-                caption = message_data.get('caption', '')
-                return f"[Image] {caption}"
-            elif message_type == 'video':
-                caption = message_data.get('caption', '')
-                return f"[Video] {caption}"
-            elif message_type == 'audio':
-                caption = message_data.get('caption', '')
-                return f"[Audio] {caption}"
-            elif message_type == 'document':
-                file_name = message_data.get('file_name', 'Document')
-                return f"[Document] {file_name}"
-            elif message_type == 'location':
-                name = message_data.get('name', 'Location')
-                return f"[Location] {name}"
-            else:
-                return f"[{message_type}] {content}"
+            formatter = self._FORMATTERS.get(message_type)
+            if formatter is not None:
+                return formatter(message_data)
+            return f"[{message_type}] {message_data.get('content', '')}"
                 
         except Exception as e:
             logger.error(f"Failed to format message: {str(e)}")
@@ -178,9 +360,9 @@ class Utils:
         Returns:
             str: Unique message ID
         """
-        timestamp = int(datetime.now().timestamp() * 1000)
-        random_suffix = hashlib.md5(str(timestamp).encode()).hexdigest()[:8]
-        return f"msg_{timestamp}_{random_suffix}"
+        # time_ns avoids the datetime allocation and float round-trip;
+        # token_hex keeps IDs unique for burst calls within one millisecond
+        return f"msg_{time.time_ns() // 1_000_000}_{secrets.token_hex(4)}"
     
     def format_timestamp(self, timestamp: Union[str, datetime, int]) -> str:
         """
@@ -193,16 +375,11 @@ class Utils:
             str: Formatted timestamp string
         """
         try:
-            if isinstance(timestamp, str):
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            elif isinstance(timestamp, datetime):
-                dt = timestamp
-            elif isinstance(timestamp, (int, float)):
-                dt = datetime.fromtimestamp(timestamp)
-            else:
-                return str(timestamp)
-            
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
+            if isinstance(timestamp, datetime):
+                return timestamp.strftime("%Y-%m-%d %H:%M:%S")
+            if isinstance(timestamp, (str, int, float)):
+                return _format_timestamp(timestamp)
+            return str(timestamp)
             
         except Exception as e:
             logger.error(f"Failed to format timestamp: {str(e)}")
@@ -219,25 +396,8 @@ class Utils:
             int: Duration in seconds
         """
         try:
-            duration_str = duration_str.lower().strip()
-            
-            # Extract number and unit
-            match = re.match(r'(\d+)([hms]?)', duration_str)
-            if not match:
-                raise ValueError(f"Invalid duration format: {duration_str}")
-            
-            number = int(match.group(1))
-            unit = match.group(2)
-            
-            if unit == 'h':
-                return number * 3600
-            elif unit == 'm':
-                return number * 60
-            elif unit == 's' or not unit:
-                return number
-            else:
-                raise ValueError(f"Invalid duration unit: {unit}")
-                
+            return _parse_duration(duration_str.lower().strip())
+
         except Exception as e:
             logger.error(f"Failed to parse duration: {str(e)}")
             raise
@@ -253,15 +413,13 @@ class Utils:
             str: Human readable size string
         """
         try:
-            if size_bytes == 0:
+            if size_bytes <= 0:
                 return "0B"
-            
-            size_names = ["B", "KB", "MB", "GB", "TB"]
-            import math
-            i = int(math.floor(math.log(size_bytes, 1024)))
-            p = math.pow(1024, i)
-            s = round(size_bytes / p, 2)
-            return f"{s} {size_names[i]}"
+
+            # bit_length // 10 is floor(log1024) without the float log
+            i = min((size_bytes.bit_length() - 1) // 10, 4)
+            s = round(size_bytes / (1 << (10 * i)), 2)
+            return f"{s} {('B', 'KB', 'MB', 'GB', 'TB')[i]}"
             
         except Exception as e:
             logger.error(f"Failed to format size: {str(e)}")
@@ -279,11 +437,8 @@ class Utils:
             str: Cleaned text
         """
         try:
-            # Remove control characters
-            cleaned = ''.join(char for char in text if ord(char) >= 32 or char in '\n\t\r')
-            
-            # Trim whitespace
-            cleaned = cleaned.strip()
+            # Remove control characters and trim whitespace
+            cleaned = text.translate(_CTRL_TRANSLATE).strip()
             
             # Truncate if needed
             if max_length and len(cleaned) > max_length:
@@ -306,18 +461,13 @@ class Utils:
             List[str]: List of mentioned JIDs
         """
         try:
-            # Pattern to match @mentions in WhatsApp
-            mention_pattern = r'@(\d+)'
-            mentions = re.findall(mention_pattern, message_text)
-            
-            # Convert to full JIDs
-            mentioned_jids = []
-            for number in mentions:
-                jid = f"{number}@s.whatsapp.net"
-                if self.is_valid_whatsapp_jid(jid):
-                    mentioned_jids.append(jid)
-            
-            return mentioned_jids
+            # The capture group already guarantees digits, so length is
+            # the only remaining validity check — no second regex pass
+            return [
+                f"{number}@s.whatsapp.net"
+                for number in _MENTION_RE.findall(message_text)
+                if 8 <= len(number) <= 15
+            ]
             
         except Exception as e:
             logger.error(f"Failed to extract mentions: {str(e)}")
@@ -334,9 +484,11 @@ class Utils:
             str: URL-encoded message data
         """
         try:
-            json_str = json.dumps(message_data, separators=(',', ':'))
-            import urllib.parse
-            return urllib.parse.quote(json_str)
+            if orjson is not None:
+                json_str = orjson.dumps(message_data).decode()
+            else:
+                json_str = json.dumps(message_data, separators=(',', ':'))
+            return quote(json_str)
             
         except Exception as e:
             logger.error(f"Failed to encode message: {str(e)}")
@@ -353,9 +505,8 @@ class Utils:
             Dict[str, Any]: Decoded message data
         """
         try:
-            import urllib.parse
-            json_str = urllib.parse.unquote(encoded_data)
-            return json.loads(json_str)
+            json_str = unquote(encoded_data)
+            return orjson.loads(json_str) if orjson is not None else json.loads(json_str)
             
         except Exception as e:
             logger.error(f"Failed to decode message: {str(e)}")
@@ -371,23 +522,7 @@ class Utils:
         Returns:
             str: Emoji representation
         """
-        status_emojis = {
-            'online': '🟢',
-            'offline': '⚫',
-            'away': '🟡',
-            'busy': '🔴',
-            'typing': '⌨️',
-            'recording': '🎤',
-            'connecting': '🔄',
-            'connected': '✅',
-            'disconnected': '❌',
-            'error': '❌',
-            'success': '✅',
-            'warning': '⚠️',
-            'info': 'ℹ️'
-        }
-        
-        return status_emojis.get(status.lower(), '•')
+        return _STATUS_EMOJIS.get(status.lower(), '•')
     
     def mask_phone_number(self, phone_number: str) -> str:
         """
@@ -401,13 +536,16 @@ class Utils:
         """
         try:
             # Extract digits
-            digits = ''.join(filter(str.isdigit, phone_number))
-            
-            if len(digits) <= 4:
-                return '*' * len(digits)
-            
+            digits = _NON_DIGIT.sub('', phone_number)
+            n = len(digits)
+
+            if n <= 4:
+                return _STARS[:n]
+
             # Show last 4 digits, mask the rest
-            return '*' * (len(digits) - 4) + digits[-4:]
+            if n - 4 <= len(_STARS):
+                return _STARS[:n - 4] + digits[-4:]
+            return '*' * (n - 4) + digits[-4:]
             
         except Exception as e:
             logger.error(f"Failed to mask phone number: {str(e)}")
@@ -434,9 +572,11 @@ class Utils:
             if not words1 or not words2:
                 return 0.0
             
-            intersection = len(words1.intersection(words2))
-            union = len(words1.union(words2))
-            
+            # Union size is derivable arithmetically; no need to build
+            # the union set
+            intersection = len(words1 & words2)
+            union = len(words1) + len(words2) - intersection
+
             return intersection / union if union > 0 else 0.0
             
         except Exception as e:
@@ -456,37 +596,42 @@ class Utils:
         """
         try:
             text = message_text.lower()
-            
-            # Common spam indicators
-            spam_indicators = [
-                'click here', 'buy now', 'limited time', 'act fast', 'free money',
-                'congratulations', 'you won', 'prize', 'lottery', 'win money',
-                'urgent', 'exclusive offer', 'special promotion', 'money back'
-            ]
-            
-            # Check for spam indicators
-            spam_score = 0
-            for indicator in spam_indicators:
-                if indicator in text:
-                    spam_score += 1
-            
-            # Check for excessive capitalization
-            if text.isupper() and len(text) > 10:
+
+            # Smallest score that clears the threshold, computed once
+            # so the scan can short-circuit as soon as it is reached
+            max_score = len(_SPAM_INDICATORS) + 3
+            needed = int(threshold * max_score) + 1
+
+            # Check for spam indicators in one pass over the text;
+            # deduplicating caps the score at one point per indicator,
+            # as the original per-indicator membership loop did
+            if _SPAM_AC is not None:
+                spam_score = len({word for _, word in _SPAM_AC.iter(text)})
+            else:
+                spam_score = len(set(_SPAM_RE.findall(text)))
+            if spam_score >= needed:
+                return True
+
+            # Check for excessive capitalization (on the original text;
+            # the lowered copy can never be uppercase)
+            if message_text.isupper() and len(message_text) > 10:
                 spam_score += 1
-            
-            # Check for excessive punctuation
-            if text.count('!') > 3 or text.count('?') > 5:
+                if spam_score >= needed:
+                    return True
+
+            # A non-spam verdict is certain once the remaining two
+            # signals cannot reach the bar
+            if spam_score + 2 < needed:
+                return False
+
+            # Punctuation and repeated-char signals from one fused scan
+            bangs, questions, has_run = _spam_signals(text)
+            if bangs > 3 or questions > 5:
                 spam_score += 1
-            
-            # Check for repeated characters
-            if re.search(r'(.)\1{4,}', text):
+            if has_run:
                 spam_score += 1
-            
-            # Normalize score
-            max_score = len(spam_indicators) + 3
-            similarity = spam_score / max_score
-            
-            return similarity > threshold
+
+            return spam_score >= needed
             
         except Exception as e:
             logger.error(f"Failed to check spam: {str(e)}")
@@ -503,21 +648,7 @@ class Utils:
             int: Priority level (1-10)
         """
         try:
-            message_type = message_data.get('type', 'text')
-            priority_map = {
-                'text': 5,
-                'image': 6,
-                'video': 7,
-                'audio': 4,
-                'document': 8,
-                'location': 9,
-                'sticker': 3,
-                'system': 10,
-                'call': 10,
-                'notification': 7
-            }
-            
-            return priority_map.get(message_type, 5)
+            return _PRIORITY_MAP.get(message_data.get('type', 'text'), 5)
             
         except Exception as e:
             logger.error(f"Failed to get message priority: {str(e)}")
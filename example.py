@@ -19,15 +19,24 @@ Author: MiniMax Agent
 import asyncio
 import logging
 import sys
-import os
-from datetime import datetime
 from pathlib import Path
 
 # Add the current directory to Python path so we can import baileyspy
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_HERE = str(Path(__file__).resolve().parent)
+sys.path.insert(0, _HERE)
+
+# Use uvloop's libuv-backed event loop when available; it cuts
+# per-await and socket overhead on the I/O-heavy connect/send paths
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 try:
     from baileyspy import BaileysClient, create_client
+    from baileyspy.messages import create_button, create_list_item
+    from baileyspy.utils import Utils
 except ImportError:
     print("❌ Baileyspy not found! Please install it first:")
     print("pip install baileyspy")
@@ -40,6 +49,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Utils is stateless; one shared instance saves a construction per
+# demo run
+_UTILS = Utils()
+
+# Constant demo payloads, built once at import instead of per run
+_DEMO_PARTICIPANTS = (
+    "1234567890@s.whatsapp.net",
+    "0987654321@s.whatsapp.net"
+)
+_POLL_OPTIONS = ("Python", "JavaScript", "Java", "C++")
+_BUTTON_SPECS = (("Yes", "yes_button"), ("No", "no_button"), ("Maybe", "maybe_button"))
+_LIST_ITEM_SPECS = (
+    ("Option 1", "Description for option 1"),
+    ("Option 2", "Description for option 2"),
+    ("Option 3", "Description for option 3")
+)
+# Entire simulated-mode output of the text demo, precomputed for the
+# common not-connected path
+_SIMULATED_TEXT_BANNER = (
+    "⚠️  Not connected to WhatsApp (demo mode)\n"
+    "💡 In real usage, connect first with client.connect()\n"
+    "📤 Sending text message to 1234567890@s.whatsapp.net\n"
+    "💬 Message sending simulated (not actually sent)\n"
+    "\n📝 Demonstrating message options:\n"
+    "💬 Message with options simulated"
+)
+_GROUP_FEATURES = (
+    "• Add participants",
+    "• Remove participants",
+    "• Promote/demote members",
+    "• Update group name/description",
+    "• Set group picture",
+    "• Generate invite links",
+    "• Join groups via invite"
+)
+
 
 class BaileyspyDemo:
     """Demonstration class for Baileyspy features"""
@@ -50,55 +95,58 @@ class BaileyspyDemo:
     
     async def run_demo(self):
         """Run the complete Baileyspy demonstration"""
-        print("🚀 Baileyspy Demonstration")
-        print("=" * 50)
-        print()
+        # Constant banner; the divider folds into the literal at compile
+        # time, so this is one write with no per-call multiply
+        print("🚀 Baileyspy Demonstration\n" + "=" * 50 + "\n")
         
         try:
-            # Demo 1: Basic client initialization
+            # Demos 1-2 set up self.client and must run in order
             await self.demo_basic_initialization()
-            
-            # Demo 2: Connection and authentication
             await self.demo_connection()
-            
-            # Demo 3: Send text messages
-            await self.demo_text_messages()
-            
-            # Demo 4: Interactive messages
-            await self.demo_interactive_messages()
-            
-            # Demo 5: Group operations
-            await self.demo_group_operations()
-            
-            # Demo 6: Media handling
-            await self.demo_media_operations()
-            
-            # Demo 7: Call management
-            await self.demo_call_operations()
-            
-            # Demo 8: Utility functions
-            await self.demo_utility_functions()
-            
+
+            # Demos 3-8 are independent; structured concurrency keeps
+            # them in one scope so the wall-clock cost is the slowest
+            # step, with cancellation and aggregation handled by the
+            # task group itself
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self.demo_text_messages())
+                tg.create_task(self.demo_interactive_messages())
+                tg.create_task(self.demo_group_operations())
+                tg.create_task(self.demo_media_operations())
+                tg.create_task(self.demo_call_operations())
+                tg.create_task(self.demo_utility_functions())
+
             print("\n✅ Baileyspy demonstration completed successfully!")
             print("🎉 All features have been demonstrated.")
-            
-        except Exception as e:
-            logger.error(f"Demo failed: {e}")
-            print(f"\n❌ Demo failed: {e}")
-        
+
+        except* Exception as eg:
+            for exc in eg.exceptions:
+                # %-style args defer formatting until the record is
+                # actually emitted
+                logger.error("Demo failed: %s", exc)
+            print(f"\n❌ Demo failed: {eg.exceptions[0]}")
+
         finally:
             if self.client:
                 await self.client.disconnect()
                 print("👋 Disconnected from WhatsApp")
     
+    def _emit(self, lines):
+        """Write one demo's buffered output with a single stdout call.
+
+        Each print() acquires the stdout lock and may flush per line;
+        batching a demo's output also keeps it contiguous when the
+        demos run concurrently under gather.
+        """
+        sys.stdout.write('\n'.join(lines) + '\n')
+
     async def demo_basic_initialization(self):
         """Demonstrate basic client initialization"""
-        print("1️⃣  Basic Client Initialization")
-        print("-" * 30)
+        out = ["1️⃣  Basic Client Initialization\n" + "-" * 30]
         
         # Create client with default settings
         self.client = BaileysClient("demo_bot")
-        print("✅ BaileysClient created with default session ID")
+        out.append("✅ BaileysClient created with default session ID")
         
         # Create client with custom configuration
         config = {
@@ -109,286 +157,277 @@ class BaileyspyDemo:
         }
         
         custom_client = create_client("custom_demo", config)
-        print("✅ BaileysClient created with custom configuration")
+        out.append("✅ BaileysClient created with custom configuration")
         
         # Get connection info
         info = custom_client.get_connection_info()
-        print(f"📋 Connection info: Session={info['session_id']}, Connected={info['is_connected']}")
+        out.append(f"📋 Connection info: Session={info['session_id']}, Connected={info['is_connected']}")
         
-        print()
+        out.append('')
+        self._emit(out)
     
     async def demo_connection(self):
         """Demonstrate connection and authentication"""
-        print("2️⃣  Connection and Authentication")
-        print("-" * 35)
+        out = ["2️⃣  Connection and Authentication\n" + "-" * 35]
         
         try:
-            print("🔗 Attempting to connect to WhatsApp...")
+            out.append("🔗 Attempting to connect to WhatsApp...")
             
             # Connect to WhatsApp
             connection_info = await self.client.connect()
             
             if connection_info['status'] == 'qr_required':
-                print("📱 QR Code Authentication Required")
-                print(f"🔲 QR Code: {connection_info['qr_code']}")
-                print("💡 In a real scenario, you would scan this QR code with your phone.")
-                print("🔄 Simulating successful connection for demo purposes...")
+                out.append("📱 QR Code Authentication Required")
+                out.append(f"🔲 QR Code: {connection_info['qr_code']}")
+                out.append("💡 In a real scenario, you would scan this QR code with your phone.")
+                out.append("🔄 Simulating successful connection for demo purposes...")
                 
                 # For demo purposes, we'll simulate successful connection
                 # In real usage, you would scan the QR code
-                print("✅ Connection simulation completed")
+                out.append("✅ Connection simulation completed")
                 self.client.is_connected = True
                 self.client.phone_number = "demo_phone_number"
             
             elif connection_info['status'] == 'connected':
-                print("✅ Successfully connected to WhatsApp")
-                print(f"📱 Phone Number: {connection_info['phone_number']}")
+                out.append("✅ Successfully connected to WhatsApp")
+                out.append(f"📱 Phone Number: {connection_info['phone_number']}")
             
             else:
-                print(f"⚠️  Connection status: {connection_info['status']}")
+                out.append(f"⚠️  Connection status: {connection_info['status']}")
         
         except Exception as e:
-            print(f"⚠️  Connection error (expected in demo): {e}")
-            print("💡 In real usage, ensure you have proper Baileys backend setup")
+            out.append(f"⚠️  Connection error (expected in demo): {e}")
+            out.append("💡 In real usage, ensure you have proper Baileys backend setup")
             
-        print()
+        out.append('')
+        self._emit(out)
     
     async def demo_text_messages(self):
         """Demonstrate text message sending"""
-        print("3️⃣  Text Message Operations")
-        print("-" * 25)
+        out = ["3️⃣  Text Message Operations\n" + "-" * 25]
         
+        # One attribute read; the common simulated path skips the
+        # option-dict allocation and send branches entirely
         if not self.client.is_connected:
-            print("⚠️  Not connected to WhatsApp (demo mode)")
-            print("💡 In real usage, connect first with client.connect()")
-        
+            out.append(_SIMULATED_TEXT_BANNER)
+            out.append('')
+            self._emit(out)
+            return
+
         try:
             # Demo JID (in real usage, this would be actual phone numbers)
             demo_jid = "1234567890@s.whatsapp.net"
-            
-            print(f"📤 Sending text message to {demo_jid}")
-            
-            if self.client.is_connected:
-                result = await self.client.send_message(demo_jid, "Hello from Baileyspy demo!")
-                print(f"✅ Message sent! ID: {result.get('message_id')}")
-            else:
-                print("💬 Message sending simulated (not actually sent)")
-            
+
+            out.append(f"📤 Sending text message to {demo_jid}")
+
+            result = await self.client.send_message(demo_jid, "Hello from Baileyspy demo!")
+            out.append(f"✅ Message sent! ID: {result.get('message_id')}")
+
             # Demonstrate message options
-            print("\n📝 Demonstrating message options:")
+            out.append("\n📝 Demonstrating message options:")
             message_options = {
                 'quoted_message_id': 'demo_quoted_msg',
                 'mentioned_jids': [demo_jid],
                 'view_once': False
             }
-            
-            if self.client.is_connected:
-                result = await self.client.send_message(
-                    demo_jid, 
-                    "This is a message with options!", 
-                    **message_options
-                )
-                print("✅ Message with options sent!")
-            else:
-                print("💬 Message with options simulated")
-            
+
+            result = await self.client.send_message(
+                demo_jid,
+                "This is a message with options!",
+                **message_options
+            )
+            out.append("✅ Message with options sent!")
+
         except Exception as e:
-            print(f"⚠️  Text message error: {e}")
-        
-        print()
+            out.append(f"⚠️  Text message error: {e}")
+
+        out.append('')
+        self._emit(out)
     
     async def demo_interactive_messages(self):
         """Demonstrate interactive message features"""
-        print("4️⃣  Interactive Message Features")
-        print("-" * 32)
+        out = ["4️⃣  Interactive Message Features\n" + "-" * 32]
         
         try:
-            from baileyspy.messages import create_button, create_list_item
-            
             # Demonstrate buttons
-            print("🔘 Creating interactive buttons:")
-            buttons = [
-                create_button("Yes", "yes_button"),
-                create_button("No", "no_button"),
-                create_button("Maybe", "maybe_button")
-            ]
+            out.append("🔘 Creating interactive buttons:")
+            buttons = [create_button(text, button_id) for text, button_id in _BUTTON_SPECS]
             
-            print("✅ Buttons created: Yes, No, Maybe")
+            out.append("✅ Buttons created: Yes, No, Maybe")
             
             # Demonstrate list items
-            print("\n📋 Creating interactive list:")
-            list_items = [
-                create_list_item("Option 1", "Description for option 1"),
-                create_list_item("Option 2", "Description for option 2"),
-                create_list_item("Option 3", "Description for option 3")
-            ]
+            out.append("\n📋 Creating interactive list:")
+            list_items = [create_list_item(title, desc) for title, desc in _LIST_ITEM_SPECS]
             
-            print("✅ List items created: Option 1, 2, 3")
+            out.append("✅ List items created: Option 1, 2, 3")
             
             # Demonstrate poll
-            print("\n📊 Creating poll message:")
-            poll_options = ["Python", "JavaScript", "Java", "C++"]
-            print("✅ Poll options created: Python, JavaScript, Java, C++")
+            out.append("\n📊 Creating poll message:")
+            poll_options = _POLL_OPTIONS
+            out.append("✅ Poll options created: Python, JavaScript, Java, C++")
             
             # In real usage, you would send these like:
             # await client.send_interactive_message(jid, "Choose:", buttons=buttons)
             # await client.send_poll_message(jid, "Favorite language?", poll_options)
             
         except Exception as e:
-            print(f"⚠️  Interactive message error: {e}")
+            out.append(f"⚠️  Interactive message error: {e}")
         
-        print()
+        out.append('')
+        self._emit(out)
     
     async def demo_group_operations(self):
         """Demonstrate group management features"""
-        print("5️⃣  Group Management Operations")
-        print("-" * 31)
+        out = ["5️⃣  Group Management Operations\n" + "-" * 31]
         
         try:
             # Demonstrate group creation
-            print("👥 Creating a new group:")
-            demo_participants = [
-                "1234567890@s.whatsapp.net",
-                "0987654321@s.whatsapp.net"
-            ]
+            out.append("👥 Creating a new group:")
+            demo_participants = _DEMO_PARTICIPANTS
             
-            print(f"📋 Participants: {len(demo_participants)} users")
-            print("✅ Group creation parameters prepared")
+            out.append(f"📋 Participants: {len(demo_participants)} users")
+            out.append("✅ Group creation parameters prepared")
             
             # Demonstrate group info retrieval
-            print("\n📊 Getting group information:")
+            out.append("\n📊 Getting group information:")
             groups = await self.client.get_groups()
-            print(f"📊 Found {len(groups)} groups (demo)")
+            out.append(f"📊 Found {len(groups)} groups (demo)")
             
             # Demonstrate group management
-            print("\n⚙️  Group management features:")
-            print("• Add participants")
-            print("• Remove participants")
-            print("• Promote/demote members")
-            print("• Update group name/description")
-            print("• Set group picture")
-            print("• Generate invite links")
-            print("• Join groups via invite")
+            out.append("\n⚙️  Group management features:")
+            out.extend(_GROUP_FEATURES)
             
         except Exception as e:
-            print(f"⚠️  Group operations error: {e}")
+            out.append(f"⚠️  Group operations error: {e}")
         
-        print()
+        out.append('')
+        self._emit(out)
     
     async def demo_media_operations(self):
         """Demonstrate media handling features"""
-        print("6️⃣  Media Operation Features")
-        print("-" * 28)
+        out = ["6️⃣  Media Operation Features\n" + "-" * 28]
         
         try:
-            # Demonstrate media types
-            print("📸 Supported media types:")
-            print("• Images: .jpg, .jpeg, .png, .gif, .webp")
-            print("• Videos: .mp4, .mov, .avi, .mkv, .webm")
-            print("• Audio: .mp3, .wav, .ogg, .aac")
-            print("• Documents: .pdf, .doc, .docx, .txt, .zip")
-            print("• Stickers: .webp")
-            
-            # Demonstrate profile picture setting
-            print("\n🖼️  Profile picture features:")
-            print("• Set personal profile picture")
-            print("• Set group profile pictures")
-            print("• Image validation and optimization")
-            
-            # Demonstrate media information
-            print("\n📊 Media information features:")
-            print("• File size validation")
-            print("• MIME type detection")
-            print("• Media metadata extraction")
-            
+            # Static banners fused into single literals — one append
+            # per block instead of one per line
+            out.append(
+                "📸 Supported media types:\n"
+                "• Images: .jpg, .jpeg, .png, .gif, .webp\n"
+                "• Videos: .mp4, .mov, .avi, .mkv, .webm\n"
+                "• Audio: .mp3, .wav, .ogg, .aac\n"
+                "• Documents: .pdf, .doc, .docx, .txt, .zip\n"
+                "• Stickers: .webp"
+            )
+            out.append(
+                "\n🖼️  Profile picture features:\n"
+                "• Set personal profile picture\n"
+                "• Set group profile pictures\n"
+                "• Image validation and optimization"
+            )
+            out.append(
+                "\n📊 Media information features:\n"
+                "• File size validation\n"
+                "• MIME type detection\n"
+                "• Media metadata extraction"
+            )
+
         except Exception as e:
-            print(f"⚠️  Media operations error: {e}")
+            out.append(f"⚠️  Media operations error: {e}")
         
-        print()
+        out.append('')
+        self._emit(out)
     
     async def demo_call_operations(self):
         """Demonstrate call management features"""
-        print("7️⃣  Voice Call Management")
-        print("-" * 23)
+        out = ["7️⃣  Voice Call Management\n" + "-" * 23]
         
         try:
-            print("📞 Call management features:")
-            print("• Initiate voice calls")
-            print("• Accept/reject incoming calls")
-            print("• End ongoing calls")
-            print("• Call status monitoring")
-            print("• Call history tracking")
-            print("• Mute/unmute calls")
-            
-            # Demonstrate call statistics
-            print("\n📊 Call statistics:")
-            call_history = await self.client.call_manager.get_call_history()
-            print(f"📋 Call history: {len(call_history)} calls recorded")
-            
-            active_calls = await self.client.call_manager.get_active_calls()
-            print(f"🔴 Active calls: {len(active_calls)}")
+            out.append("📞 Call management features:")
+            out.append("• Initiate voice calls")
+            out.append("• Accept/reject incoming calls")
+            out.append("• End ongoing calls")
+            out.append("• Call status monitoring")
+            out.append("• Call history tracking")
+            out.append("• Mute/unmute calls")
+            
+            # Demonstrate call statistics; the two probes are
+            # independent, so overlap their round trips
+            out.append("\n📊 Call statistics:")
+            call_history, active_calls = await asyncio.gather(
+                self.client.call_manager.get_call_history(),
+                self.client.call_manager.get_active_calls()
+            )
+            out.append(f"📋 Call history: {len(call_history)} calls recorded")
+            out.append(f"🔴 Active calls: {len(active_calls)}")
             
         except Exception as e:
-            print(f"⚠️  Call operations error: {e}")
+            out.append(f"⚠️  Call operations error: {e}")
         
-        print()
+        out.append('')
+        self._emit(out)
     
     async def demo_utility_functions(self):
         """Demonstrate utility functions"""
-        print("8️⃣  Utility Functions")
-        print("-" * 20)
+        out = ["8️⃣  Utility Functions\n" + "-" * 20]
         
         try:
-            from baileyspy.utils import Utils
-            
-            utils = Utils()
-            
-            # Demonstrate phone number formatting
-            print("📱 Phone number utilities:")
+            # Only consumer of datetime; deferring the import keeps it
+            # off the script's cold-start path
+            from datetime import datetime
+
+            utils = _UTILS
             demo_number = "1234567890"
-            formatted_jid = utils.format_phone_number(demo_number, "US")
-            print(f"📞 {demo_number} → {formatted_jid}")
-            
-            # Demonstrate JID validation
-            print("\n✔️  JID validation:")
-            is_valid = utils.is_valid_whatsapp_jid(formatted_jid)
-            print(f"✅ {formatted_jid} is {'valid' if is_valid else 'invalid'}")
-            
-            # Demonstrate message formatting
-            print("\n📝 Message formatting:")
             message_data = {
                 'type': 'image',
                 'caption': 'Beautiful sunset'
             }
-            formatted = utils.format_message_for_display(message_data)
-            print(f"📄 {formatted}")
-            
-            # Demonstrate time utilities
-            print("\n⏰ Time utilities:")
             current_time = datetime.now()
-            formatted_time = utils.format_timestamp(current_time)
-            print(f"🕐 Current time: {formatted_time}")
-            
-            # Demonstrate file size formatting
-            print("\n💾 File size utilities:")
-            size_readable = utils.human_readable_size(1024 * 1024)  # 1MB
-            print(f"📊 1048576 bytes = {size_readable}")
+
+            # Sync utility calls run off the event loop thread; the JID
+            # validation needs the formatted number first, the rest are
+            # batched into one gather
+            formatted_jid = await asyncio.to_thread(
+                utils.format_phone_number, demo_number, "US"
+            )
+            is_valid, formatted, formatted_time, size_readable = await asyncio.gather(
+                asyncio.to_thread(utils.is_valid_whatsapp_jid, formatted_jid),
+                asyncio.to_thread(utils.format_message_for_display, message_data),
+                asyncio.to_thread(utils.format_timestamp, current_time),
+                asyncio.to_thread(utils.human_readable_size, 1024 * 1024)  # 1MB
+            )
+
+            out.append("📱 Phone number utilities:")
+            out.append(f"📞 {demo_number} → {formatted_jid}")
+
+            out.append("\n✔️  JID validation:")
+            out.append(f"✅ {formatted_jid} is {'valid' if is_valid else 'invalid'}")
+
+            out.append("\n📝 Message formatting:")
+            out.append(f"📄 {formatted}")
+
+            out.append("\n⏰ Time utilities:")
+            out.append(f"🕐 Current time: {formatted_time}")
+
+            out.append("\n💾 File size utilities:")
+            out.append(f"📊 1048576 bytes = {size_readable}")
             
         except Exception as e:
-            print(f"⚠️  Utility functions error: {e}")
+            out.append(f"⚠️  Utility functions error: {e}")
         
-        print()
+        out.append('')
+        self._emit(out)
 
 
 async def main():
     """Main demonstration function"""
-    print("🎯 Welcome to Baileyspy Demo!")
-    print("This demonstration shows the key features of Baileyspy.")
-    print("In a real environment, you would need to:")
-    print("• Set up the Baileys Node.js backend")
-    print("• Scan QR codes for authentication")
-    print("• Have valid phone numbers for testing")
-    print()
+    print(
+        "🎯 Welcome to Baileyspy Demo!\n"
+        "This demonstration shows the key features of Baileyspy.\n"
+        "In a real environment, you would need to:\n"
+        "• Set up the Baileys Node.js backend\n"
+        "• Scan QR codes for authentication\n"
+        "• Have valid phone numbers for testing\n"
+    )
     
     demo = BaileyspyDemo()
     await demo.run_demo()